@@ -4,16 +4,15 @@ import curses
 import time
 import threading
 from typing import Optional
-from vmware_manager.api.vm_get import get_vm_power_state
+from vmware_manager.api.vm_get import get_vm_power_states, power_state_changed
 from vmware_manager.ui.main_menu import MainMenu
 from vmware_manager.ui.config_menu import ConfigMenu
-from vmware_manager.ui.vm_menu import VMMenu
-from vmware_manager.config.settings import (
-    menu_lock
-)
+from vmware_manager.ui.vm_menu import VMMenu, vm_workers
+from vmware_manager.utils.lock import menu_lock
 from vmware_manager.utils.logging import log_message
+from vmware_manager.utils.wakeup import wake_ui, wait_for_input, SUPPORTED as WAKEUP_SUPPORTED
 import traceback
-from .config.themes import initialize_theme_colors, get_current_theme, THEMES, load_themes
+from .config.themes import initialize_theme_colors, get_current_theme, get_themes, load_themes
 import atexit
 import signal
 import sys
@@ -21,21 +20,39 @@ import sys
 # Global flag for clean shutdown
 _SHUTDOWN_FLAG = False
 
+# Set in main() so cleanup can stop the worker directly
+_refresh_thread: Optional[threading.Thread] = None
+_main_menu: Optional[MainMenu] = None
+
+# How often submenus redraw while idle (seconds)
+SUBMENU_REDRAW_INTERVAL = 1.0
+
+# How often an idle main menu checks for a terminal resize (seconds). ncurses
+# handles SIGWINCH itself and only reports KEY_RESIZE from getch, and select()
+# is retried rather than interrupted by the signal, so nothing else wakes us.
+RESIZE_CHECK_INTERVAL = 1.0
+
+# Bursts of wakeups are coalesced into at most one draw per frame (~60 Hz)
+MIN_FRAME_INTERVAL = 1 / 60
+
 def setup_locale():
     """Setup proper locale for UTF-8 support."""
     try:
         # Try to set the locale to the user's default with UTF-8
         locale.setlocale(locale.LC_ALL, '')
         
-        # If that doesn't work, explicitly try UTF-8
-        if not any(x in locale.getlocale()[1].lower() for x in ['utf', 'utf8', 'utf-8']):
-            # Try common UTF-8 locales
-            for loc in ['en_US.UTF-8', 'C.UTF-8', 'POSIX.UTF-8']:
-                try:
-                    locale.setlocale(locale.LC_ALL, loc)
-                    break
-                except locale.Error:
-                    continue
+        # Already UTF-8, nothing else to do
+        if 'UTF' in (locale.getlocale()[1] or '').upper():
+            log_message(f"Locale set to: {locale.getlocale()}")
+            return
+        
+        # Otherwise try common UTF-8 locales
+        for loc in ['en_US.UTF-8', 'C.UTF-8', 'POSIX.UTF-8']:
+            try:
+                locale.setlocale(locale.LC_ALL, loc)
+                break
+            except locale.Error:
+                continue
         
         # Set environment variables as backup
         os.environ['LC_ALL'] = 'en_US.UTF-8'
@@ -53,22 +70,27 @@ def cleanup_handler(signum=None, frame=None):
     _SHUTDOWN_FLAG = True
     
     log_message("Cleaning up application resources...")
-    # Force cleanup any existing threads
-    for thread in threading.enumerate():
-        if thread.name == "VMRefreshWorker":
-            try:
-                thread.join(timeout=0.5)
-            except:
-                pass
+    # Tell the worker to stop, then wake it so it sees the flag right away
+    if _main_menu is not None:
+        _main_menu._shutdown = True
+    power_state_changed.set()
+    vm_workers.shutdown()  # Drop queued VM menu work, a request in flight doesn't hold exit
+    if _refresh_thread is not None and _refresh_thread is not threading.current_thread():
+        _refresh_thread.join(timeout=0.5)
     sys.exit(0)
 
 def vm_refresh_worker(main_menu: MainMenu):
     """Background thread to update VM power states."""
     REFRESH_INTERVAL = 5
-    POWER_STATE_INTERVAL = 10  # Power state checks every 10 seconds
+    POWER_STATE_INTERVAL = 10  # Base interval for power state checks
+    MAX_POWER_STATE_INTERVAL = 60  # Back off to at most once a minute when idle
     FULL_REFRESH_INTERVAL = 30  # Full refresh every 30 seconds
+    FAST_POLL_INTERVAL = 2  # Poll quickly right after a power action
+    FAST_POLL_CYCLES = 6
     last_full_refresh = 0
     last_power_check = 0
+    unchanged_cycles = 0  # Consecutive power checks with no state change
+    fast_cycles = 0  # Remaining fast polling cycles
     
     # Add shutdown flag
     main_menu._shutdown = False
@@ -77,28 +99,61 @@ def vm_refresh_worker(main_menu: MainMenu):
         try:
             current_time = time.time()
             
+            # A power action was accepted, so poll quickly for a while
+            if power_state_changed.is_set():
+                power_state_changed.clear()
+                fast_cycles = FAST_POLL_CYCLES
+                unchanged_cycles = 0
+            
+            if fast_cycles > 0:
+                power_interval = FAST_POLL_INTERVAL
+            else:
+                power_interval = min(MAX_POWER_STATE_INTERVAL,
+                                     POWER_STATE_INTERVAL * 2 ** min(unchanged_cycles, 4))
+            
             if hasattr(main_menu, 'current_menu') and main_menu.current_menu is not None:
-                time.sleep(REFRESH_INTERVAL)
+                power_state_changed.wait(REFRESH_INTERVAL)
                 continue
             
-            if menu_lock.acquire(timeout=1.0):
-                try:
-                    if not hasattr(main_menu, 'current_menu') or main_menu.current_menu is None:
-                        if current_time - last_full_refresh >= FULL_REFRESH_INTERVAL:
-                            main_menu.refresh_vm_list(force=True)
-                            last_full_refresh = current_time
-                        elif current_time - last_power_check >= POWER_STATE_INTERVAL:
-                            # Just update power states
-                            for vm in main_menu.vm_list:
-                                vm_id = vm.get('id')
-                                if vm_id:
-                                    vm['power_state'] = get_vm_power_state(vm_id)
-                            main_menu.draw_screen()
-                            last_power_check = current_time
-                finally:
-                    menu_lock.release()
+            if current_time - last_full_refresh >= FULL_REFRESH_INTERVAL:
+                # Fetch outside the lock, only hold it for the swap and redraw
+                new_list = main_menu._fetch_vm_list_unlocked(force=True)
+                if menu_lock.acquire(timeout=1.0):
+                    try:
+                        if getattr(main_menu, 'current_menu', None) is None:
+                            main_menu.set_vm_list(new_list)
+                    finally:
+                        menu_lock.release()
+                    wake_ui()
+                last_full_refresh = current_time
+            elif current_time - last_power_check >= power_interval:
+                # Just update power states, querying the API without the lock held
+                vm_ids = [vm.get('id') for vm in list(main_menu.vm_list) if vm.get('id')]
+                # Fetched live and in parallel. This thread can wait on the API, and the
+                # cache would hold a state for its TTL, then serve it stale while revalidating.
+                states = get_vm_power_states(vm_ids, force=True)
+                changed = False
+                if menu_lock.acquire(timeout=1.0):
+                    try:
+                        # The rows are shared with the vm_get cache snapshot and read by the
+                        # UI without the lock, so changed rows are copied, never written to
+                        new_list = []
+                        for vm in main_menu.vm_list:
+                            state = states.get(vm.get('id'))
+                            if state is not None and state != vm.get('power_state'):
+                                vm = {**vm, 'power_state': state}
+                                changed = True
+                            new_list.append(vm)
+                        if changed:
+                            main_menu.set_vm_list(new_list)  # The UI loop repaints the power column
+                        unchanged_cycles = 0 if changed else unchanged_cycles + 1
+                        if fast_cycles > 0:
+                            fast_cycles -= 1
+                    finally:
+                        menu_lock.release()
+                last_power_check = current_time
             
-            time.sleep(REFRESH_INTERVAL)
+            power_state_changed.wait(FAST_POLL_INTERVAL if fast_cycles > 0 else REFRESH_INTERVAL)
             
         except Exception as e:
             log_message(f"Error in refresh worker: {str(e)}", "ERROR")
@@ -107,10 +162,10 @@ def vm_refresh_worker(main_menu: MainMenu):
 
 def apply_theme(stdscr):
     """Apply theme to the entire screen safely."""
-    theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
+    themes = get_themes()  # Not THEMES, which load_themes() rebinds after import
+    theme = themes.get(get_current_theme(), themes["ubuntu"])
     
     # Fill entire screen with theme background
-    max_y, max_x = stdscr.getmaxyx()
     attr = curses.color_pair(1)  # Use color pair 1 for basic text
     if theme["use_bold"]:
         attr |= curses.A_BOLD
@@ -119,14 +174,8 @@ def apply_theme(stdscr):
         # Set background character and attribute
         stdscr.bkgd(' ', attr)
         
-        # Fill screen line by line, being careful of boundaries
-        for y in range(max_y):
-            try:
-                # Write one less than max_x to avoid errors
-                stdscr.addstr(y, 0, ' ' * (max_x - 1), attr)
-            except curses.error:
-                pass  # Skip if we hit the bottom-right corner
-        
+        # bkgd paints every cell on the next refresh, no need to fill manually
+        stdscr.clear()
         stdscr.refresh()
         
     except Exception as e:
@@ -134,6 +183,7 @@ def apply_theme(stdscr):
 
 def main(stdscr):
     """Main application entry point."""
+    global _refresh_thread, _main_menu
     try:
         # Register cleanup handlers
         atexit.register(cleanup_handler)
@@ -157,10 +207,10 @@ def main(stdscr):
         # Now create the UI with themes ready
         log_message("Creating main menu...")
         main_menu = MainMenu(stdscr)
+        _main_menu = main_menu
         main_menu.current_menu = None  # Add this attribute to track current submenu
         current_menu: Optional[ConfigMenu | VMMenu] = None
-        main_menu.draw_empty_screen()
-        stdscr.refresh()
+        curses.doupdate()  # Show the empty screen MainMenu staged
         
         # Initial VM list fetch (only done once)
         with menu_lock:
@@ -176,12 +226,25 @@ def main(stdscr):
             name="VMRefreshWorker"
         )
         refresh_thread.start()
+        _refresh_thread = refresh_thread
+        
+        # Block on input and wake only for keys or background updates where supported,
+        # otherwise fall back to a 100ms polling timeout
+        stdscr.timeout(0 if WAKEUP_SUPPORTED else 100)
         
         try:
+            handled_key = False  # A key was just handled, so draw before blocking again
+            last_draw = 0.0
             while not _SHUTDOWN_FLAG:
-                # Shorter timeout for more responsive input
-                stdscr.timeout(100)  # 100ms timeout for better responsiveness
                 key = stdscr.getch()
+                if key == -1 and WAKEUP_SUPPORTED and not handled_key:
+                    # Submenus refresh their own VM state on draw, so give them a periodic tick
+                    wait_for_input(RESIZE_CHECK_INTERVAL if current_menu is None else SUBMENU_REDRAW_INTERVAL)
+                    # Let a burst of log lines or worker updates settle into one frame
+                    delay = MIN_FRAME_INTERVAL - (time.monotonic() - last_draw)
+                    if delay > 0:
+                        time.sleep(delay)
+                    key = stdscr.getch()
                 
                 if current_menu:
                     main_menu.current_menu = current_menu  # Track active submenu
@@ -189,9 +252,17 @@ def main(stdscr):
                 else:
                     main_menu.current_menu = None  # Clear submenu tracking
                     main_menu.draw_screen()
+                last_draw = time.monotonic()
                 
+                handled_key = key != -1
                 if key == -1:  # No input
                     continue
+                
+                if key == curses.KEY_RESIZE:
+                    main_menu.handle_resize()
+                    if current_menu:
+                        current_menu.handle_resize()
+                    continue
                     
                 if key == ord('q'):
                     break
@@ -207,13 +278,9 @@ def main(stdscr):
                         log_message("Windows setup complete")
                         
                         log_message("Drawing initial config menu...")
-                        current_menu.draw()
+                        current_menu.draw()  # Flushes with curses.doupdate()
                         log_message("Initial draw complete")
                         
-                        # Force screen update
-                        curses.doupdate()
-                        log_message("Screen update complete")
-                        
                     except Exception as e:
                         log_message(f"Error creating config menu: {str(e)}", "ERROR")
                         log_message(f"Traceback: {traceback.format_exc()}", "ERROR")
@@ -224,9 +291,8 @@ def main(stdscr):
                         current_menu = None
                         # Force a complete redraw of main menu when returning from config
                         initialize_theme_colors()  # Reinitialize colors
-                        main_menu.draw_empty_screen()  # Draw empty screen first
-                        main_menu.draw_screen()  # Then draw content
-                        curses.doupdate()  # Force update
+                        main_menu.draw_empty_screen()  # Stage the empty screen first
+                        main_menu.draw_screen()  # Then draw content, one update for both
                 else:
                     result = main_menu.handle_input(key)
                     if isinstance(result, VMMenu):
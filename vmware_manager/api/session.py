@@ -0,0 +1,22 @@
+import requests
+from requests.adapters import HTTPAdapter
+from ..config.settings import (
+    VMWARE_USERNAME,
+    VMWARE_PASSWORD
+)
+
+# Default (connect, read) timeout in seconds for read-only API calls
+REQUEST_TIMEOUT = (2, 5)
+
+def create_session() -> requests.Session:
+    """Create a pooled session with credentials preset for the VMware REST API."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.auth = (VMWARE_USERNAME, VMWARE_PASSWORD)
+    session.verify = False
+    return session
+
+# Single shared session so every API call reuses sockets
+SESSION = create_session()
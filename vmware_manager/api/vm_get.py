@@ -3,108 +3,286 @@ import json
 import time
 import os
 import re
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict
 from ..utils.logging import log_message
+from ..utils.workers import WorkerPool
+from .. import config
 from ..config.settings import (
-    VMWARE_API_URL,
-    VMWARE_USERNAME,
-    VMWARE_PASSWORD,
-    menu_lock
+    VMWARE_API_URL
 )
+from .session import SESSION, REQUEST_TIMEOUT
 
 # Cache settings and variables
-CACHE_TIMEOUT = 5  # Cache VM data for 5 seconds
-vm_list_cache = []
-last_refresh = 0
-power_state_cache = {}
-vm_details_cache = {}
+# Per-endpoint cache lifetimes (seconds), overridable via cache_ttl_<endpoint>
+TTL = {
+    'list': config.get('cache_ttl_list', 30),     # VMs are rarely added/removed
+    'power': config.get('cache_ttl_power', 5),    # Power state changes often
+    'details': config.get('cache_ttl_details', 60)  # CPU/memory rarely change
+}
+MAX_STALE = 60  # Serve expired data for up to 60 seconds while revalidating
+STALE_BACKOFF = 2  # Wait before retrying a failed background refresh
+# Caches are immutable snapshots: readers grab the current reference without
+# locking, writers build a new dict and rebind it in a single assignment
+_list_cache_ref = {'snapshot': [], 'ts': 0}
+_last_etag = None
+_last_modified = None
+_power_cache_ref = {'snapshot': {}, 'ts': 0}  # snapshot maps vm_id -> (cache_time, state)
+_power_validators = {}  # vm_id -> (ETag, Last-Modified) of the cached power state
+_cache_write_lock = threading.Lock()  # Serializes writers only, readers never block
+vm_details_cache = {}  # vm_id -> (cache_time, details, ETag, Last-Modified)
 
+# Set when a power action may have changed a VM's state
+power_state_changed = threading.Event()
+
+# Timeouts are logged at most once per interval per endpoint
+TIMEOUT_LOG_INTERVAL = 60
+_last_timeout_log = {}
+
+def _log_timeout(key: str, message: str) -> None:
+    """Log a request timeout, throttled so a hung API doesn't flood the log."""
+    now = time.time()
+    if now - _last_timeout_log.get(key, 0) >= TIMEOUT_LOG_INTERVAL:
+        _last_timeout_log[key] = now
+        log_message(message, "ERROR")
+
+# Bounded fan-out for per-VM power state lookups
+MAX_POWER_WORKERS = 16
+
+# Background revalidation of expired cache entries, on daemon threads so one
+# waiting on a slow host doesn't hold up quitting
+_refresh_workers = WorkerPool(max_workers=2, name="VMCacheRefresh")
+_pending_refreshes = set()
+_retry_after = {}
+_refresh_lock = threading.Lock()  # Guards _pending_refreshes and _retry_after
+
+def _schedule_refresh(key, func, *args) -> None:
+    """Submit a background refresh unless one is already pending or backing off."""
+    with _refresh_lock:
+        if key in _pending_refreshes or time.time() < _retry_after.get(key, 0):
+            return
+        _pending_refreshes.add(key)
+
+    def run():
+        try:
+            func(*args)
+        finally:
+            with _refresh_lock:
+                _pending_refreshes.discard(key)
+
+    _refresh_workers.submit(run)
+
+def _back_off(key) -> None:
+    """Hold off refreshing key again after a failed background refresh."""
+    with _refresh_lock:
+        _retry_after[key] = time.time() + STALE_BACKOFF
+
+def _update_power_cache(vm_id: str, entry: Optional[tuple] = None) -> None:
+    """Swap in a new power state snapshot with vm_id set to entry (or removed)."""
+    global _power_cache_ref
+    with _cache_write_lock:
+        snapshot = dict(_power_cache_ref['snapshot'])
+        if entry is None:
+            snapshot.pop(vm_id, None)
+        else:
+            snapshot[vm_id] = entry
+        _power_cache_ref = {'snapshot': snapshot, 'ts': time.time()}
+
+def _validator_headers(etag: Optional[str], last_modified: Optional[str]) -> dict:
+    """Return conditional request headers for a cached response, preferring the ETag."""
+    if etag:
+        return {'If-None-Match': etag}
+    if last_modified:
+        return {'If-Modified-Since': last_modified}
+    return {}
+
+_VMX_RE = re.compile(r'Virtual Machines[/\\]([^/\\]+)[/\\][^/\\]+\.vmx$')
+
+@functools.lru_cache(maxsize=512)
 def clean_vm_name(path: str) -> str:
     """Extract clean VM name from path."""
-    match = re.search(r'Virtual Machines[/\\]([^/\\]+)[/\\][^/\\]+\.vmx$', path)
+    match = _VMX_RE.search(path)
     if match:
         return match.group(1)
     return os.path.splitext(os.path.basename(path))[0]
 
-def get_vm_list(force: bool = False) -> list:
-    """Get list of VMs from API."""
-    global vm_list_cache, last_refresh  # Declare globals
+def get_vm_list(force: bool = False, cache_fallback: bool = True) -> list:
+    """Get list of VMs from API.
     
-    if not force and vm_list_cache and time.time() - last_refresh < CACHE_TIMEOUT:
-        return vm_list_cache
+    Expired entries younger than MAX_STALE are returned immediately while a
+    background refresh runs. With cache_fallback, API errors return the last
+    known list instead of an empty one.
+    """
+    cache = _list_cache_ref
+    if not force and cache['snapshot']:
+        age = time.time() - cache['ts']
+        if age < TTL['list']:
+            return cache['snapshot']
+        if cache_fallback and age < MAX_STALE:
+            _schedule_refresh('list', _refresh_vm_list)
+            return cache['snapshot']
     
+    vm_list = _fetch_vm_list()
+    if vm_list is None:
+        cache = _list_cache_ref
+        if cache_fallback and cache['snapshot'] and time.time() - cache['ts'] < MAX_STALE:
+            return cache['snapshot']
+        return []
+    return vm_list
+
+def _refresh_vm_list() -> None:
+    """Background refresh of the VM list cache."""
+    if _fetch_vm_list() is None:
+        _back_off('list')
+
+def _fetch_vm_list() -> Optional[list]:
+    """Fetch the VM list from the API and update the cache. Returns None on failure."""
+    global _list_cache_ref, _last_etag, _last_modified  # Declare globals
+    
+    cached_list = _list_cache_ref['snapshot']
     try:
         log_message("API CALL: GET /vms (List VMs)")
-        response = requests.get(
-            f"{VMWARE_API_URL}",
-            auth=(VMWARE_USERNAME, VMWARE_PASSWORD),
-            verify=False
-        )
+        # Revalidate against the cached list when the server gave us a validator
+        headers = _validator_headers(_last_etag, _last_modified) if cached_list else {}
+        response = SESSION.get(f"{VMWARE_API_URL}", headers=headers, timeout=REQUEST_TIMEOUT)
+        
+        if response.status_code == 304 and cached_list:
+            # Revalidated, so the cached list counts as fresh again. Its rows carry the
+            # power states from the last 200; the power cache has the newer ones.
+            power = _power_cache_ref['snapshot']
+            vm_list = [
+                {**vm, 'power_state': power[vm['id']][1]}
+                if vm['id'] in power and power[vm['id']][1] != vm.get('power_state') else vm
+                for vm in cached_list
+            ]
+            _list_cache_ref = {'snapshot': vm_list, 'ts': time.time()}
+            return vm_list
         
         if response.status_code == 200:
+            _last_etag = response.headers.get('ETag')
+            _last_modified = response.headers.get('Last-Modified')
             vm_list = []
             for vm in response.json():
                 try:
-                    vm_id = vm.get('id')
-                    path = vm.get('path', '')
-                    name = clean_vm_name(path)
-                    
-                    if vm_id:
-                        # Get power state from power endpoint
-                        power_state = get_vm_power_state(vm_id)
-                        vm['name'] = name
-                        vm['power_state'] = power_state
+                    if vm.get('id'):
+                        vm['name'] = clean_vm_name(vm.get('path', ''))
                         vm_list.append(vm)
                 except Exception as e:
                     log_message(f"Error processing VM entry: {str(e)}", "ERROR")
                     continue
             
-            vm_list_cache = vm_list
-            last_refresh = time.time()
+            # Fetch power states in parallel instead of one round-trip per VM
+            states = get_vm_power_states([vm['id'] for vm in vm_list])
+            for vm in vm_list:
+                vm['power_state'] = states[vm['id']]
+            
+            _list_cache_ref = {'snapshot': vm_list, 'ts': time.time()}
             return vm_list
+        log_message(f"Error getting VM list: status {response.status_code}", "ERROR")
+    except requests.Timeout:
+        _log_timeout('list', "Timed out getting VM list")
     except Exception as e:
         log_message(f"Error getting VM list: {str(e)}", "ERROR")
-    return []
+    return None
+
+def invalidate_power_state(vm_id: str) -> None:
+    """Drop a cached power state and wake the refresh worker."""
+    _update_power_cache(vm_id)
+    power_state_changed.set()
+
+def get_vm_power_states(vm_ids: List[str], force: bool = False) -> Dict[str, str]:
+    """Get the power states of several VMs, fetching them in parallel."""
+    if not vm_ids:
+        return {}
+    fetch = functools.partial(get_vm_power_state, force=force)
+    with ThreadPoolExecutor(max_workers=min(MAX_POWER_WORKERS, len(vm_ids))) as executor:
+        return dict(zip(vm_ids, executor.map(fetch, vm_ids)))
 
-def get_vm_power_state(vm_id: str) -> str:
-    """Get power state of specific VM."""
-    global power_state_cache  # Declare global
+def get_vm_power_state(vm_id: str, cache_fallback: bool = True, force: bool = False) -> str:
+    """Get power state of specific VM.
+    
+    Expired entries younger than MAX_STALE are returned immediately while a
+    background refresh runs. With force, the cache is revalidated now even if
+    the entry is fresh. With cache_fallback, API errors return the last known
+    state instead of 'UNKNOWN'.
+    """
     current_time = time.time()
+    cached = _power_cache_ref['snapshot'].get(vm_id)
     
-    # Return cached value if fresh
-    if vm_id in power_state_cache:
-        cache_time, state = power_state_cache[vm_id]
-        if current_time - cache_time < CACHE_TIMEOUT:
+    if cached and not force:
+        cache_time, state = cached
+        age = current_time - cache_time
+        # Return cached value if fresh
+        if age < TTL['power']:
             return state
+        # Serve stale value and revalidate in the background
+        if cache_fallback and age < MAX_STALE:
+            _schedule_refresh(('power', vm_id), _refresh_power_state, vm_id)
+            return state
+
+    state = _fetch_power_state(vm_id)
+    if state is None:
+        if cache_fallback and cached and current_time - cached[0] < MAX_STALE:
+            return cached[1]
+        return 'UNKNOWN'
+    return state
+
+def _refresh_power_state(vm_id: str) -> None:
+    """Background refresh of a single power state cache entry."""
+    if _fetch_power_state(vm_id) is None:
+        _back_off(('power', vm_id))
 
+def _fetch_power_state(vm_id: str) -> Optional[str]:
+    """Fetch power state from the API and update the cache. Returns None on failure."""
+    cached = _power_cache_ref['snapshot'].get(vm_id)
     try:
         log_message(f"API CALL: GET /vms/{vm_id}/power (Get Power State)")
-        response = requests.get(
-            f"{VMWARE_API_URL}/{vm_id}/power",
-            auth=(VMWARE_USERNAME, VMWARE_PASSWORD),
-            verify=False
-        )
+        # Revalidate the cached state rather than refetching it, when we have one
+        headers = _validator_headers(*_power_validators.get(vm_id, (None, None))) if cached else {}
+        response = SESSION.get(f"{VMWARE_API_URL}/{vm_id}/power", headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304 and cached:
+            _update_power_cache(vm_id, (time.time(), cached[1]))
+            return cached[1]
         if response.ok:
             data = response.json()
             state = data.get('power_state', 'UNKNOWN')
-            power_state_cache[vm_id] = (current_time, state)
+            _power_validators[vm_id] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            _update_power_cache(vm_id, (time.time(), state))
             return state
-        return 'UNKNOWN'
+        log_message(f"Error getting VM power state: status {response.status_code}", "ERROR")
+    except requests.Timeout:
+        _log_timeout('power', "Timed out getting VM power state")
     except Exception as e:
         log_message(f"Error getting VM power state: {str(e)}", "ERROR")
-        return 'UNKNOWN'
+    return None
 
 def get_vm_details(vm_id: str) -> Optional[Dict]:
     """Get detailed information about a VM."""
+    current_time = time.time()
+    
+    # Return cached value if fresh
+    cached = vm_details_cache.get(vm_id)
+    if cached and current_time - cached[0] < TTL['details']:
+        return cached[1]
+    
     try:
         log_message(f"API CALL: GET /vms/{vm_id} (Get VM Details)")
-        response = requests.get(
-            f"{VMWARE_API_URL}/{vm_id}",
-            auth=(VMWARE_USERNAME, VMWARE_PASSWORD),
-            verify=False
-        )
+        # Expired details are revalidated, a 304 reuses them without parsing a body
+        headers = _validator_headers(cached[2], cached[3]) if cached else {}
+        response = SESSION.get(f"{VMWARE_API_URL}/{vm_id}", headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304 and cached:
+            vm_details_cache[vm_id] = (current_time, *cached[1:])
+            return cached[1]
         response.raise_for_status()
-        return response.json()
+        details = response.json()
+        vm_details_cache[vm_id] = (current_time, details, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return details
+    except requests.Timeout:
+        _log_timeout('details', f"Timed out fetching VM details for {vm_id}")
+        # Fall back to the last known details if we have any
+        return cached[1] if cached else None
     except Exception as e:
         log_message(f"Failed to fetch VM details for {vm_id}: {str(e)}", "ERROR")
         return None 
\ No newline at end of file
@@ -4,11 +4,10 @@ import traceback
 from typing import Optional
 from vmware_manager.utils.logging import log_message
 from vmware_manager.config.settings import (
-    VMWARE_API_URL,
-    VMWARE_USERNAME,
-    VMWARE_PASSWORD,
-    menu_lock
+    VMWARE_API_URL
 )
+from vmware_manager.api.session import SESSION
+from vmware_manager.api.vm_get import invalidate_power_state
 
 def vm_action(vm_id: str, action: str, force: bool = False, menu=None) -> bool:
     """
@@ -34,12 +33,7 @@ def vm_action(vm_id: str, action: str, force: bool = False, menu=None) -> bool:
         
         api_action = action_map.get(action)
         if not api_action:
-            # Use timeout to prevent deadlock
-            if menu_lock.acquire(timeout=1.0):
-                try:
-                    log_message(f"Invalid power action requested: {action}", "ERROR")
-                finally:
-                    menu_lock.release()
+            log_message(f"Invalid power action requested: {action}", "ERROR")
             return False
 
         url = f"{VMWARE_API_URL}/{vm_id}/power"
@@ -58,19 +52,16 @@ def vm_action(vm_id: str, action: str, force: bool = False, menu=None) -> bool:
             f"Body: {api_data}"
         ]
         
-        log_message(f"API Request details:")
-        for msg in api_msg:
-            log_message(msg)
-            if menu:
-                menu.add_api_message(msg)
+        # One log record per request (kept on one line for the log window)
+        log_message("API Request details: " + " | ".join(api_msg))
+        if menu:
+            menu.add_api_messages(api_msg)
         
         log_message(f"API CALL: PUT /vms/{vm_id}/power action={action} force={force}")
-        response = requests.put(
+        response = SESSION.put(
             url,
             headers=headers,
             data=api_data,
-            auth=(VMWARE_USERNAME, VMWARE_PASSWORD),
-            verify=False,
             timeout=10
         )
         
@@ -82,41 +73,24 @@ def vm_action(vm_id: str, action: str, force: bool = False, menu=None) -> bool:
         
         # VMware API returns 204 for accepted requests
         if response.status_code in [200, 204]:  # Accept both success codes
-            if menu_lock.acquire(timeout=1.0):
-                try:
-                    log_message(f"Power {action} request accepted by API")
-                finally:
-                    menu_lock.release()
+            # Drop the stale state and have the refresh worker poll quickly
+            invalidate_power_state(vm_id)
+            
+            log_message(f"Power {action} request accepted by API")
             
             # Return True immediately for successful request
             # The background refresh will update the status
             return True
             
-        if menu_lock.acquire(timeout=1.0):
-            try:
-                log_message(f"Failed to {action} VM. Status code: {response.status_code}", "ERROR")
-            finally:
-                menu_lock.release()
+        log_message(f"Failed to {action} VM. Status code: {response.status_code}", "ERROR")
         return False
 
     except requests.Timeout:
-        if menu_lock.acquire(timeout=1.0):
-            try:
-                log_message("Request timed out while attempting power action", "ERROR")
-            finally:
-                menu_lock.release()
+        log_message("Request timed out while attempting power action", "ERROR")
         return False
     except requests.RequestException as e:
-        if menu_lock.acquire(timeout=1.0):
-            try:
-                log_message(f"Network error during power action: {str(e)}", "ERROR")
-            finally:
-                menu_lock.release()
+        log_message(f"Network error during power action: {str(e)}", "ERROR")
         return False
     except Exception as e:
-        if menu_lock.acquire(timeout=1.0):
-            try:
-                log_message(f"Error during {action} operation: {str(e)}", "ERROR")
-            finally:
-                menu_lock.release()
+        log_message(f"Error during {action} operation: {str(e)}", "ERROR")
         return False 
\ No newline at end of file
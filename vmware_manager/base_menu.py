@@ -13,18 +13,15 @@ class BaseMenu:
         """Draw a consistent box around a window using Unicode characters."""
         height, width = window.getmaxyx()
         
-        # Draw corners
-        window.addstr(0, 0, self.BOX_CHARS['top_left'])
-        window.addstr(0, width-1, self.BOX_CHARS['top_right'])
-        window.addstr(height-1, 0, self.BOX_CHARS['bottom_left'])
-        window.addstr(height-1, width-1, self.BOX_CHARS['bottom_right'])
+        horizontal = self.BOX_CHARS['horizontal'] * (width - 2)
+        vertical = self.BOX_CHARS['vertical']
         
-        # Draw horizontal lines
-        for x in range(1, width-1):
-            window.addstr(0, x, self.BOX_CHARS['horizontal'])
-            window.addstr(height-1, x, self.BOX_CHARS['horizontal'])
+        # Draw top and bottom edges with one call each
+        window.addstr(0, 0, self.BOX_CHARS['top_left'] + horizontal + self.BOX_CHARS['top_right'])
+        window.addstr(height-1, 0, self.BOX_CHARS['bottom_left'] + horizontal)
+        window.insstr(height-1, width-1, self.BOX_CHARS['bottom_right'])
         
         # Draw vertical lines
         for y in range(1, height-1):
-            window.addstr(y, 0, self.BOX_CHARS['vertical'])
-            window.addstr(y, width-1, self.BOX_CHARS['vertical']) 
\ No newline at end of file
+            window.addstr(y, 0, vertical)
+            window.addstr(y, width-1, vertical) 
\ No newline at end of file
@@ -15,8 +15,8 @@ class Settings:
         """Load config from file."""
         if os.path.exists(self.file_path):
             try:
-                with open(self.file_path, 'r') as f:
-                    loaded_data = json.load(f)
+                with open(self.file_path, 'rb') as f:
+                    loaded_data = json.loads(f.read())
                     log_message(f"Loaded config: {loaded_data}")
                     self.data.update(loaded_data)
             except Exception as e:
@@ -31,8 +31,11 @@ class Settings:
             log_message(f"Saving config to {self.file_path}...")
             log_message(f"Config data to save: {self.data}")
             
-            with open(self.file_path, 'w') as f:
-                json.dump(self.data, f, indent=4)
+            # Write to a temp file and swap it in so a crash can't truncate the config
+            tmp_path = self.file_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(json.dumps(self.data, indent=4).encode('utf-8'))
+            os.replace(tmp_path, self.file_path)
             
             log_message("Config saved successfully")
                 
@@ -44,6 +47,8 @@ class Settings:
 
     def __setitem__(self, key, value):
         """Set a config value and save it."""
+        if key in self.data and self.data[key] == value:
+            return  # Unchanged, skip the disk write
         log_message(f"Setting config[{key}] = {value}")
         self.data[key] = value
         self.save()
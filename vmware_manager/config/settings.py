@@ -1,20 +1,11 @@
-import curses
-import threading
-import json
 import os
-from typing import Set, Dict, Optional, Callable
-from ..utils.shared import status_log  # Import from shared instead of creating
-from queue import Queue
-from ..utils.logging import log_message
-from . import config  # Import from config package
-from .themes import get_current_theme  # Only import what we need
+from typing import Set, Dict
+from . import config  # Settings singleton, the one place config is loaded
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
-# Replace status_log list with a thread-safe queue
-menu_lock = threading.Lock()  # Keep for VM list updates only
+# Load environment variables, skipping the .env parse when they're already set
+if not (os.environ.get('VMWARE_USERNAME') and os.environ.get('VMWARE_PASSWORD')):
+    load_dotenv()
 
 # VMware Workstation REST API settings
 VMWARE_API_URL = os.getenv('VMWARE_API_URL', 'http://localhost:8697/api/vms')
@@ -28,16 +19,14 @@ if not all([VMWARE_USERNAME, VMWARE_PASSWORD]):
     )
 
 # Shared Data
-hidden_vms: Set[str] = set()  # Store VM IDs that should be hidden
+hidden_vms: Set[str] = set()  # Store VM IDs that should be hidden, change with toggle_hidden_vm
+_hidden_vms_version = 0  # Bumped on every hidden_vms change
 vm_details: Dict[str, dict] = {}  # Maps VM ID to details (name, cpu, memory)
 
 # Timing settings
 POWER_STATE_REFRESH = 5  # Update power states every 5 seconds
 UI_UPDATE_INTERVAL = 1.0  # Minimum time between UI updates
 
-# File paths
-CONFIG_FILE = 'vmware_config.json'
-
 # User customization
 USER_THEMES = {}  # For saved random themes 
 
@@ -54,37 +43,18 @@ def get_current_theme() -> str:
 
 def update_theme(new_theme: str):
     """Update current theme and save to config."""
-    config.config['theme'] = new_theme
-    save_config(config.config)
-
-def load_config():
-    """Load configuration from file."""
-    config = {}
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, 'r') as f:
-                config = json.load(f)
-        except Exception as e:
-            config = {}
-    return config
-
-def save_config(config):
-    """Save configuration to file."""
-    try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=4)
-    except Exception as e:
-        pass  # Silently fail config save
-
-# Load config at startup
-config = load_config()
-
-# UI settings with persistence
-INVERT_BACKGROUND = config.get('invert_background', False)
-INVERT_TEXT = config.get('invert_text', False)
-
-# Other settings
-menu_lock = threading.Lock()
-hidden_vms: Set[str] = set()
-vm_details: Dict[str, dict] = {}
-initialized_themes: Dict = {} 
\ No newline at end of file
+    config.settings['theme'] = new_theme
+
+def toggle_hidden_vm(vm_id: str) -> bool:
+    """Hide a shown VM or show a hidden one. Returns True if it is now hidden."""
+    global _hidden_vms_version
+    _hidden_vms_version += 1
+    if vm_id in hidden_vms:
+        hidden_vms.remove(vm_id)
+        return False
+    hidden_vms.add(vm_id)
+    return True
+
+def hidden_vms_version() -> int:
+    """Return a counter that changes whenever hidden_vms does, a cheap cache key."""
+    return _hidden_vms_version
@@ -1,10 +1,28 @@
 import curses
 from typing import Dict
 from ..utils.logging import log_message
-import json
+from . import config as user_config  # Persisted user settings (inversion flags)
 import os
+import atexit
+import random
 from pathlib import Path
 
+# Use orjson for themes.json when available, stdlib json otherwise
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')  # Same bytes as orjson
+
+    _loads = json.loads
+
 # Define the config directory in user's home
 CONFIG_DIR = os.path.expanduser("~/.config/vmware_manager")
 THEMES_FILE = os.path.join(CONFIG_DIR, "themes.json")
@@ -93,9 +111,23 @@ DEFAULT_THEMES = {
     }
 }
 
+# Names of the built-in themes, checked on every save/delete
+BUILTIN_NAMES = frozenset(DEFAULT_THEMES)
+
 # Working copy of themes
 THEMES = DEFAULT_THEMES.copy()
 _current_theme = "ubuntu"  # Default theme
+_themes_dirty = False  # Unsaved theme selection, flushed on exit
+_themes_mtime = 0  # mtime of THEMES_FILE when we last read or wrote it
+
+# Curses attributes for the theme color pairs, set by initialize_theme_colors
+CP_TEXT = 0
+CP_TEXT_BOLD = 0
+CP_ON = 0
+CP_OFF = 0
+CP_SELECTED = 0
+_colors_initialized_for = None  # Pair colors last passed to init_pair
+_theme_version = 0  # Bumped when the theme or its colors change, see theme_version
 
 def ensure_config_dir():
     """Create config directory if it doesn't exist."""
@@ -104,31 +136,55 @@ def ensure_config_dir():
 
 def save_themes():
     """Save custom themes and current theme selection to config file."""
+    global _themes_dirty, _themes_mtime
     ensure_config_dir()
     
     # Only save custom themes (not built-in ones)
     custom_themes = {name: theme for name, theme in THEMES.items() 
-                    if name not in DEFAULT_THEMES}
+                    if name not in BUILTIN_NAMES}
     
     config = {
         "current_theme": _current_theme,
         "custom_themes": custom_themes
     }
     
-    with open(THEMES_FILE, 'w') as f:
-        json.dump(config, f, indent=4)
+    with open(THEMES_FILE, 'wb') as f:
+        f.write(_dumps(config))
+    
+    _themes_dirty = False
+    _themes_mtime = os.stat(THEMES_FILE).st_mtime
+
+def flush_themes():
+    """Save the theme selection if it changed since the last save."""
+    if _themes_dirty:
+        try:
+            save_themes()
+        except Exception as e:
+            log_message(f"Error saving themes: {str(e)}", "ERROR")
+
+atexit.register(flush_themes)
 
 def load_themes():
     """Load themes from config file."""
-    global THEMES, _current_theme
+    global THEMES, _current_theme, _themes_mtime, _theme_version
+    
+    try:
+        mtime = os.stat(THEMES_FILE).st_mtime
+    except OSError:
+        mtime = None
+    
+    # Nothing changed on disk since we last read or wrote it
+    if mtime is not None and mtime == _themes_mtime:
+        return
     
     # Start with default themes
     THEMES = DEFAULT_THEMES.copy()
     
-    if os.path.exists(THEMES_FILE):
+    if mtime is not None:
         try:
-            with open(THEMES_FILE, 'r') as f:
-                config = json.load(f)
+            with open(THEMES_FILE, 'rb') as f:
+                config = _loads(f.read())
+            _themes_mtime = mtime
                 
             # Load custom themes
             if "custom_themes" in config:
@@ -137,6 +193,9 @@ def load_themes():
             # Load current theme selection
             if "current_theme" in config and config["current_theme"] in THEMES:
                 _current_theme = config["current_theme"]
+                _theme_version += 1
+            
+            log_message(f"Loaded themes. Current theme is: {_current_theme}")
                 
         except Exception as e:
             log_message(f"Error loading themes: {str(e)}", "ERROR")
@@ -144,34 +203,56 @@ def load_themes():
 
 def change_theme(new_theme: str) -> bool:
     """Change the current theme."""
-    global _current_theme
+    global _current_theme, _themes_dirty, _theme_version
     
     if new_theme not in THEMES:
         return False
         
     _current_theme = new_theme
-    save_themes()  # Save the selection
+    _theme_version += 1
+    _themes_dirty = True  # Saved on exit by flush_themes
     return True
 
 def initialize_theme_colors():
-    """Initialize color pairs for themes."""
-    log_message("Starting color pair initialization...")
-    curses.start_color()
-    curses.use_default_colors()
-
+    """Initialize color pairs for themes, skipping the work if the colors are unchanged."""
+    global CP_TEXT, CP_TEXT_BOLD, CP_ON, CP_OFF, CP_SELECTED, _colors_initialized_for, _theme_version
     theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
     bg = theme["background"]
     fg = theme["text"]
+    
+    # Inversion is applied once here, so every pair and CP_* attribute picks it up
+    if user_config.get('invert_background', False):
+        bg = invert_color(bg)
+    if user_config.get('invert_text', False):
+        fg = invert_color(fg)
+
+    # Keyed on the resolved colors rather than the theme name, so a new random
+    # theme or an inversion toggle still reinitializes
+    colors = (fg, bg, theme["powered_on"], theme["powered_off"], theme["selected"], theme["selected_bg"])
+    if colors == _colors_initialized_for:
+        return
+
+    if _colors_initialized_for is None:  # Color support only needs starting once
+        curses.start_color()
+        curses.use_default_colors()
 
     try:
         # Initialize basic color pairs
-        log_message("Initializing theme colors...")
         curses.init_pair(1, fg, bg)                  # Basic text
         curses.init_pair(2, theme["powered_on"], bg) # Status on
         curses.init_pair(3, theme["powered_off"], bg) # Status off
         curses.init_pair(4, theme["selected"], theme["selected_bg"]) # Selected item
+        
+        # Precompute the attributes so draw code doesn't call color_pair per line
+        CP_TEXT = curses.color_pair(1)
+        CP_TEXT_BOLD = CP_TEXT | curses.A_BOLD
+        CP_ON = curses.color_pair(2)
+        CP_OFF = curses.color_pair(3)
+        CP_SELECTED = curses.color_pair(4)
+        _colors_initialized_for = colors
+        _theme_version += 1
 
-        log_message("Color pair initialization complete")
+        log_message(f"Initialized colors for theme: {get_current_theme()}")
     except Exception as e:
         log_message(f"Error initializing colors: {str(e)}", "ERROR")
         raise
@@ -180,54 +261,59 @@ def get_current_theme() -> str:
     """Get the current theme."""
     return _current_theme
 
+def theme_version() -> int:
+    """Return a counter that changes whenever the theme or its colors do, a cheap cache key."""
+    return _theme_version
+
 def get_themes(force_refresh=False, theme=None) -> Dict:
-    """Return available color themes."""
-    global THEMES
-    
-    # Return cached themes unless force refresh
-    if theme is not None and not force_refresh:
-        return THEMES
-        
-    current_theme = theme if theme is not None else _current_theme
-    log_message(f"Building theme cache. Current theme is: {current_theme}")
+    """Return available color themes.
     
+    The arguments are kept for existing callers; THEMES is always current.
+    """
     return THEMES
 
+# Color pair definitions, built once; treat as read-only
+_COLOR_PAIRS = {
+    # Default theme pairs
+    1: (curses.COLOR_WHITE, -1),      # Title
+    2: (curses.COLOR_WHITE, -1),      # Text
+    3: (curses.COLOR_WHITE, -1),      # Border
+    4: (curses.COLOR_BLACK, curses.COLOR_WHITE),  # Selected
+    5: (curses.COLOR_GREEN, -1),      # Status on
+    6: (curses.COLOR_RED, -1),        # Status off
+    7: (curses.COLOR_YELLOW, -1),     # Status suspended
+    
+    # Ubuntu theme pairs
+    8: (curses.COLOR_WHITE, curses.COLOR_MAGENTA),   # Title
+    9: (curses.COLOR_WHITE, -1),                     # Text (normal white)
+    10: (curses.COLOR_WHITE, -1),                    # Border
+    11: (curses.COLOR_BLACK, curses.COLOR_WHITE),    # Selected
+    12: (curses.COLOR_GREEN, -1),                    # Status on
+    13: (curses.COLOR_RED, -1),                      # Status off
+    14: (curses.COLOR_YELLOW, -1),                   # Status suspended
+}
+
 def get_color_pairs() -> dict:
     """Define the actual color pairs."""
-    return {
-        # Default theme pairs
-        1: (curses.COLOR_WHITE, -1),      # Title
-        2: (curses.COLOR_WHITE, -1),      # Text
-        3: (curses.COLOR_WHITE, -1),      # Border
-        4: (curses.COLOR_BLACK, curses.COLOR_WHITE),  # Selected
-        5: (curses.COLOR_GREEN, -1),      # Status on
-        6: (curses.COLOR_RED, -1),        # Status off
-        7: (curses.COLOR_YELLOW, -1),     # Status suspended
-        
-        # Ubuntu theme pairs
-        8: (curses.COLOR_WHITE, curses.COLOR_MAGENTA),   # Title
-        9: (curses.COLOR_WHITE, -1),                     # Text (normal white)
-        10: (curses.COLOR_WHITE, -1),                    # Border
-        11: (curses.COLOR_BLACK, curses.COLOR_WHITE),    # Selected
-        12: (curses.COLOR_GREEN, -1),                    # Status on
-        13: (curses.COLOR_RED, -1),                      # Status off
-        14: (curses.COLOR_YELLOW, -1),                   # Status suspended
-    }
+    return _COLOR_PAIRS
+
+# Inverse of each curses color, indexed by the color number (0-7)
+_INVERT_COLOR = [0] * 8
+_INVERT_COLOR[curses.COLOR_BLACK] = curses.COLOR_WHITE
+_INVERT_COLOR[curses.COLOR_WHITE] = curses.COLOR_BLACK
+_INVERT_COLOR[curses.COLOR_BLUE] = curses.COLOR_YELLOW
+_INVERT_COLOR[curses.COLOR_YELLOW] = curses.COLOR_BLUE
+_INVERT_COLOR[curses.COLOR_GREEN] = curses.COLOR_MAGENTA
+_INVERT_COLOR[curses.COLOR_MAGENTA] = curses.COLOR_GREEN
+_INVERT_COLOR[curses.COLOR_RED] = curses.COLOR_CYAN
+_INVERT_COLOR[curses.COLOR_CYAN] = curses.COLOR_RED
+_INVERT_COLOR = tuple(_INVERT_COLOR)
 
 def invert_color(color):
     """Invert a curses color."""
-    color_map = {
-        curses.COLOR_BLACK: curses.COLOR_WHITE,
-        curses.COLOR_WHITE: curses.COLOR_BLACK,
-        curses.COLOR_BLUE: curses.COLOR_YELLOW,
-        curses.COLOR_YELLOW: curses.COLOR_BLUE,
-        curses.COLOR_GREEN: curses.COLOR_MAGENTA,
-        curses.COLOR_MAGENTA: curses.COLOR_GREEN,
-        curses.COLOR_RED: curses.COLOR_CYAN,
-        curses.COLOR_CYAN: curses.COLOR_RED
-    }
-    return color_map.get(color, color)
+    if isinstance(color, int) and 0 <= color < 8:
+        return _INVERT_COLOR[color]
+    return color
 
 def debug_config():
     """Print current config state for debugging."""
@@ -243,18 +329,12 @@ def save_custom_theme(theme_dict, name):
         return False
     
     # Don't allow overwriting built-in themes
-    if name in ["ubuntu", "matrix", "dracula", "solarized", "nord"]:
+    if name in BUILTIN_NAMES:
         return False
         
     try:
-        # Load existing custom themes
-        custom_themes = THEMES
-        
-        # Add new theme
-        custom_themes[name] = theme_dict
-        
-        # Update THEMES
-        THEMES.update(custom_themes)
+        THEMES[name] = theme_dict
+        save_themes()  # Persist so the theme survives a restart
         log_message(f"Saved custom theme: {name}")
         return True
     except Exception as e:
@@ -263,7 +343,7 @@ def save_custom_theme(theme_dict, name):
 
 def delete_custom_theme(name):
     """Delete a custom theme."""
-    if name in THEMES and name not in ["ubuntu", "matrix", "dracula", "solarized", "nord"]:
+    if name in THEMES and name not in BUILTIN_NAMES:
         # Remove from THEMES
         del THEMES[name]
         
@@ -278,40 +358,32 @@ def apply_theme(stdscr) -> None:
         theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
         
         # Fill entire screen with theme background
-        max_y, max_x = stdscr.getmaxyx()
-        attr = curses.color_pair(1)  # Use color pair 1 for basic text
-        if theme.get("use_bold", True):
-            attr |= curses.A_BOLD
+        attr = CP_TEXT_BOLD if theme.get("use_bold", True) else CP_TEXT  # Basic text
         
         # Set background character and attribute
         stdscr.bkgd(' ', attr)
         
-        # Fill screen line by line, being careful of boundaries
-        for y in range(max_y):
-            try:
-                # Write one less than max_x to avoid errors
-                stdscr.addstr(y, 0, ' ' * (max_x - 1), attr)
-            except curses.error:
-                pass  # Skip if we hit the bottom-right corner
-        
+        # bkgd paints every cell on the next refresh; erase() avoids the forced
+        # full terminal repaint that clear() would trigger
+        stdscr.erase()
         stdscr.refresh()
         
     except Exception as e:
         log_message(f"Error applying theme: {str(e)}", "ERROR")
 
+# Colors for random themes, and the text colors allowed on each background
+COLORS = (
+    curses.COLOR_BLACK, curses.COLOR_BLUE, curses.COLOR_CYAN,
+    curses.COLOR_GREEN, curses.COLOR_MAGENTA, curses.COLOR_RED,
+    curses.COLOR_WHITE, curses.COLOR_YELLOW
+)
+_TEXT_CHOICES = {bg: tuple(c for c in COLORS if c != bg) for bg in COLORS}
+
 def generate_random_theme():
     """Generate a random theme."""
-    import random
-    colors = [
-        curses.COLOR_BLACK, curses.COLOR_BLUE, curses.COLOR_CYAN,
-        curses.COLOR_GREEN, curses.COLOR_MAGENTA, curses.COLOR_RED,
-        curses.COLOR_WHITE, curses.COLOR_YELLOW
-    ]
-    
     # Ensure background and text have good contrast
-    background = random.choice(colors)
-    text_colors = [c for c in colors if c != background]
-    text = random.choice(text_colors)
+    background = random.choice(COLORS)
+    text = random.choice(_TEXT_CHOICES[background])
     
     return {
         "name": "Random Theme",
@@ -1,8 +1,15 @@
 import curses
-from ..config.themes import get_themes, get_current_theme, THEMES
-from ..config.settings import status_log
+import re
+from collections import deque
+from itertools import islice
+from ..config.themes import get_themes, get_current_theme, theme_version
+from ..utils.shared import MSG_API, drain_status_log
+from ..config import themes as theme_attrs  # CP_* color attributes
 from ..utils.logging import log_message
-from queue import Empty
+from ..utils.wakeup import wake_ui
+
+# Case-insensitive match without allocating a lowered copy of each message
+_POWERED_OFF_RE = re.compile('poweredoff', re.IGNORECASE)
 
 class BaseMenu:
     # Add box drawing constants
@@ -14,16 +21,33 @@ class BaseMenu:
         'bottom_left': "└",
         'bottom_right': "┘",
     }
+    MAX_MESSAGES = 1000  # Per message buffer
+    
+    ASCII_BOX_CHARS = {
+        'horizontal': "-",
+        'vertical': "|",
+        'top_left': "+",
+        'top_right': "+",
+        'bottom_left': "+",
+        'bottom_right': "+",
+    }
     
     def __init__(self, stdscr):
         self.stdscr = stdscr
-        self.cached_messages = []  # All messages
-        self.api_messages = []     # API messages only
-        self.log_messages = []     # Non-API messages only
-        theme_name = get_current_theme()
-        self.current_theme = get_themes(theme=theme_name)[theme_name]  # Get the specific theme dictionary
+        # Bounded buffers, old messages fall off the front automatically
+        self.cached_messages = deque(maxlen=self.MAX_MESSAGES)  # All messages
+        self.api_messages = deque(maxlen=self.MAX_MESSAGES)     # API messages only
+        self.log_messages = deque(maxlen=self.MAX_MESSAGES)     # Non-API messages only
+        self.api_lines = deque(maxlen=6)  # API messages formatted once for the API window
+        self._theme_version = None      # theme_version() the cached theme was resolved for
+        self.update_theme()  # Resolve the theme dict and base attr once
         self.main_window = None
         self.status_window = None
+        self._dirty = True              # Force the next draw to repaint
+        self._log_dirty = True          # New log messages since the status window was drawn
+        self._last_frame_hash = None    # Hash of the last drawn frame contents
+        self._drawn_regions = {}        # Region name -> contents last drawn there
+        self._box_sizes = {}            # Window -> (height, width) for draw_box
         self.setup_windows()
 
     def setup_windows(self):
@@ -35,48 +59,115 @@ class BaseMenu:
         self.main_window = curses.newwin(main_height, width - 4, 2, 2)
         self.main_window.keypad(1)  # Enable keypad for arrow keys
         self.status_window = curses.newwin(10, width - 4, main_height + 2, 2)
-        
-        # Apply theme background to each window
+        self.cache_window_sizes()
         self.apply_theme()
 
+    def cache_window_sizes(self):
+        """Record window sizes once; they only change when setup_windows recreates the windows."""
+        self.main_size = self.main_window.getmaxyx()
+        self.separator = "─" * self.main_size[1]  # Rule under the title and instructions
+        # Every pane spans the same columns; this is the space inside the border and margin
+        self.pane_width = self.status_window.getmaxyx()[1] - 4
+        self._box_sizes.clear()  # The windows were just rebuilt
+
+    def create_pane_pad(self, window, rows: int) -> tuple:
+        """Create a pad for the text lines inside window's border and margin.
+        
+        Returns the pad and the screen area it is shown in, worked out once
+        here so drawing doesn't query the window geometry. Include the pad in
+        themed_windows so it gets the theme background.
+        """
+        pad = curses.newpad(rows, self.pane_width + 1)  # Spare column so a full-width last line can't raise
+        top, left = window.getbegyx()
+        rows = min(rows, window.getmaxyx()[0] - 2)
+        return pad, (top + 1, left + 2, top + rows, left + 1 + self.pane_width)
+
+    @staticmethod
+    def show_pane_pad(pad, area: tuple):
+        """Copy a pad into its pane area in one call."""
+        pad.noutrefresh(0, 0, *area)
+
+    def handle_resize(self):
+        """Rebuild the windows for the new terminal size and repaint everything."""
+        height, width = self.stdscr.getmaxyx()
+        log_message(f"Terminal resized to {width}x{height}")
+        self.stdscr.erase()  # Drop whatever the old, larger windows left behind
+        self.stdscr.noutrefresh()
+        try:
+            self.setup_windows()
+        except curses.error as e:
+            log_message(f"Terminal too small to resize windows: {str(e)}", "ERROR")
+        self.mark_dirty()
+
     def apply_theme(self):
         """Apply current theme to all windows."""
-        theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
-        attr = curses.color_pair(1)
-        if theme.get("use_bold", True):
-            attr |= curses.A_BOLD
-        
-        # Apply to all windows
+        self.update_theme()  # Theme may have just changed
+        self.mark_dirty()
+        self.apply_background()
         for window in [self.main_window, self.status_window]:
-            if window:
-                window.bkgd(' ', attr)
-                window.refresh()
+            window.noutrefresh()  # The next draw flushes them
+
+    def themed_windows(self) -> tuple:
+        """Return the windows drawn in the theme background; subclasses add theirs."""
+        return (self.main_window, self.status_window)
+
+    def apply_background(self):
+        """Set the theme background on every window.
+        
+        curses.newwin windows don't inherit stdscr's background, so each one
+        needs its own bkgd. Called when the windows are built and when the
+        theme changes, never per frame.
+        """
+        for window in self.themed_windows():
+            window.bkgd(' ', self._theme_attr)
+
+    def request_draw(self):
+        """Ask the UI loop to redraw on its next frame instead of drawing now."""
+        wake_ui()
+
+    def mark_dirty(self):
+        """Force the next draw to repaint even if the frame is unchanged."""
+        self._dirty = True
+        self._log_dirty = True
+        self._drawn_regions.clear()
+
+    def frame_changed(self, frame: tuple) -> bool:
+        """Return True if frame differs from the last drawn one or a redraw was requested."""
+        frame_hash = hash(frame)
+        if not self._dirty and frame_hash == self._last_frame_hash:
+            return False
+        self._last_frame_hash = frame_hash
+        self._dirty = False
+        return True
+
+    def region_changed(self, name: str, contents) -> bool:
+        """Return True if a screen region needs repainting to show contents."""
+        if name in self._drawn_regions and self._drawn_regions[name] == contents:
+            return False
+        self._drawn_regions[name] = contents
+        return True
 
     def update_theme(self):
-        """Update the cached theme."""
-        self.current_theme = get_themes()[get_current_theme()]
+        """Update the cached theme and its base text attribute if the theme changed."""
+        version = theme_version()
+        if version == self._theme_version:
+            return
+        self._theme_version = version
+        theme_name = get_current_theme()
+        themes = get_themes(theme=theme_name)
+        self.current_theme = themes.get(theme_name, themes["ubuntu"])  # Get the specific theme dictionary
+        self._theme_attr = theme_attrs.CP_TEXT_BOLD if self.current_theme.get("use_bold", True) else theme_attrs.CP_TEXT
 
     def draw_box(self, window):
         """Draw a consistent box around a window."""
-        height, width = window.getmaxyx()
+        size = self._box_sizes.get(window)
+        if size is None:
+            size = self._box_sizes[window] = window.getmaxyx()
+        height, width = size
         
         try:
             # First try with Unicode box chars
-            window.addch(0, 0, self.BOX_CHARS['top_left'])
-            window.addch(0, width-1, self.BOX_CHARS['top_right'])
-            window.addch(height-1, 0, self.BOX_CHARS['bottom_left'])
-            window.addch(height-1, width-1, self.BOX_CHARS['bottom_right'])
-            
-            # Draw horizontal lines
-            for x in range(1, width-1):
-                window.addch(0, x, self.BOX_CHARS['horizontal'])
-                window.addch(height-1, x, self.BOX_CHARS['horizontal'])
-            
-            # Draw vertical lines
-            for y in range(1, height-1):
-                window.addch(y, 0, self.BOX_CHARS['vertical'])
-                window.addch(y, width-1, self.BOX_CHARS['vertical'])
-            
+            self._draw_box_chars(window, height, width, self.BOX_CHARS)
         except curses.error:
             try:
                 # Fall back to ASCII box drawing
@@ -84,95 +175,103 @@ class BaseMenu:
             except curses.error:
                 try:
                     # Manual ASCII box as last resort
-                    window.addch(0, 0, '+')
-                    window.addch(0, width-1, '+')
-                    window.addch(height-1, 0, '+')
-                    window.addch(height-1, width-1, '+')
-                    
-                    for x in range(1, width-1):
-                        window.addch(0, x, '-')
-                        window.addch(height-1, x, '-')
-                    
-                    for y in range(1, height-1):
-                        window.addch(y, 0, '|')
-                        window.addch(y, width-1, '|')
-                        
+                    self._draw_box_chars(window, height, width, self.ASCII_BOX_CHARS)
                 except curses.error as e:
                     log_message(f"Failed to draw box: {str(e)}", "ERROR")
 
+    def _draw_box_chars(self, window, height: int, width: int, chars: dict):
+        """Draw a box with one call per edge."""
+        horizontal = chars['horizontal'] * (width - 2)
+        vertical = chars['vertical']
+        
+        window.addstr(0, 0, chars['top_left'] + horizontal + chars['top_right'])
+        window.addstr(height-1, 0, chars['bottom_left'] + horizontal)
+        # insstr doesn't advance the cursor, so the bottom-right cell can't raise
+        window.insstr(height-1, width-1, chars['bottom_right'])
+        
+        # Draw vertical lines with one vline per edge. vline needs a single-byte
+        # chtype, so the Unicode bar is drawn with the equivalent ACS glyph.
+        if not vertical.isascii():
+            vertical = curses.ACS_VLINE
+        window.vline(1, 0, vertical, height-2)
+        window.vline(1, width-1, vertical, height-2)
+
     def draw_status_window(self):
         """Draw the status window with non-API log messages."""
+        # Get any new messages, and skip the redraw if none were logged
+        self.collect_messages()
+        if not self._log_dirty:
+            return
+        self._log_dirty = False
+        
         self.status_window.clear()
         self.draw_box(self.status_window)
         self.status_window.addstr(0, 2, " Log Messages ")
         
-        # Get any new messages
-        self.collect_messages()
-        
         # Draw non-API messages
-        max_x = self.status_window.getmaxyx()[1] - 4
-        messages_to_show = [msg for msg in self.log_messages[-8:] 
-                           if "API CALL:" not in msg]  # Filter out API messages
+        max_x = self.pane_width
+        messages_to_show = [msg[:max_x] for msg in self.tail(self.log_messages, 8)]  # Already API-free
         
-        for i, msg in enumerate(messages_to_show):
-            try:
-                self.draw_colored_message(self.status_window, i + 1, 2, msg[:max_x], max_x)
-            except curses.error:
-                pass
+        # One try for the whole block; a failed line means we hit the window edge
+        try:
+            for i, msg in enumerate(messages_to_show):
+                self.draw_colored_message(self.status_window, i + 1, 2, msg, max_x)
+        except curses.error:
+            pass
 
-        self.status_window.refresh()
+        self.status_window.noutrefresh()  # Caller flushes with curses.doupdate()
 
     def draw_title(self, title: str, instructions: str):
         """Draw title and instructions with theme colors."""
-        max_x = self.main_window.getmaxyx()[1]
-        theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
+        max_x = self.main_size[1]
         
         # Draw title
         x = max_x//2 - len(title)//2
-        self.main_window.attron(curses.color_pair(1))
+        self.main_window.attron(theme_attrs.CP_TEXT)
         self.main_window.addstr(0, x, title, curses.A_BOLD)
-        self.main_window.attroff(curses.color_pair(1))
+        self.main_window.attroff(theme_attrs.CP_TEXT)
         
         # Draw instructions
         x = max_x//2 - len(instructions)//2
         self.main_window.addstr(1, x, instructions)
         
         # Draw separator
-        self.main_window.addstr(2, 0, "─" * max_x)
+        self.main_window.addstr(2, 0, self.separator)
 
     def draw_colored_message(self, window, y: int, x: int, message: str, max_width: int):
         """Draw a message with color for certain keywords."""
         try:
             # Check for power state keywords
-            if 'poweredoff' in message.lower():
-                window.attron(curses.color_pair(3))  # Red color pair
+            if _POWERED_OFF_RE.search(message):
+                window.attron(theme_attrs.CP_OFF)  # Red color pair
                 window.addstr(y, x, message[:max_width])
-                window.attroff(curses.color_pair(3))
+                window.attroff(theme_attrs.CP_OFF)
             else:
                 window.addstr(y, x, message[:max_width])
         except curses.error:
             pass
 
+    @staticmethod
+    def format_api_message(msg: str) -> str:
+        """Shorten '[INFO] 14:22:04 - API CALL: GET /vms' to '14:22:04  GET /vms'."""
+        prefix, sep, api_call = msg.partition(" - ")  # '[level] timestamp', message
+        if not sep:
+            return msg  # Fallback - show raw message if parsing fails
+        timestamp = prefix.rsplit(" ", 1)[-1]
+        return f"{timestamp}  {api_call.replace('API CALL: ', '', 1).strip()}"
+
+    @staticmethod
+    def tail(messages, count: int) -> list:
+        """Return the last count messages of a buffer (deques can't be sliced)."""
+        return list(islice(reversed(messages), count))[::-1]
+
     def collect_messages(self):
         """Collect new messages from the queue."""
-        while True:
-            try:
-                msg = status_log.get_nowait()
-                self.cached_messages.append(msg)
-                if "API CALL:" in msg:
-                    self.api_messages.append(msg)  # Remove debug logging
-                else:
-                    self.log_messages.append(msg)
-            except Empty:
-                break
-            except Exception as e:
-                break  # Just break, don't log here
-
-        # Keep message lists at reasonable sizes
-        max_messages = 1000
-        if len(self.cached_messages) > max_messages:
-            self.cached_messages = self.cached_messages[-max_messages:]
-        if len(self.api_messages) > max_messages:
-            self.api_messages = self.api_messages[-max_messages:]
-        if len(self.log_messages) > max_messages:
-            self.log_messages = self.log_messages[-max_messages:] 
\ No newline at end of file
+        for kind, msg in drain_status_log():
+            self.cached_messages.append(msg)
+            if kind == MSG_API:
+                self.api_messages.append(msg)  # Remove debug logging
+                self.api_lines.append(self.format_api_message(msg))
+            else:
+                self.log_messages.append(msg)
+                self._log_dirty = True
\ No newline at end of file
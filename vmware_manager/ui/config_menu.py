@@ -1,12 +1,11 @@
 import curses
+from collections import deque
 from typing import Dict
 from ..config.settings import (
-    INVERT_BACKGROUND,
-    INVERT_TEXT,
     USER_THEMES,
-    status_log,
     hidden_vms,
-    menu_lock,
+    hidden_vms_version,
+    toggle_hidden_vm,
     initialized_themes,
     update_theme       # Keep this for saving to config
 )
@@ -16,16 +15,27 @@ from ..config.themes import (
     initialize_theme_colors,
     apply_theme,
     get_current_theme,  # Get this from themes.py instead of settings.py
-    THEMES,
+    theme_version,
     generate_random_theme,
     save_custom_theme,
     change_theme
 )
+from ..config import themes as theme_attrs  # CP_* color attributes
+from ..config import config  # Settings singleton, saves on change
 from ..utils.logging import log_message
-from queue import Empty
+from ..utils.lock import menu_lock
+from ..utils.shared import drain_status_log
 from ..api.vm_get import get_vm_list
 from .base_menu import BaseMenu
 
+TITLE = "Configuration Menu"
+# Navigation bar for each mode of the menu, see ConfigMenu.current_mode
+NAVIGATION = {
+    'theme': "↑/↓: Navigate | Enter: Select | q: Cancel",
+    'vm': "↑/↓: Navigate | Enter: Toggle Visibility",
+    'main': "↑/↓: Navigate | Enter: Select | q: Exit",
+}
+
 class ConfigMenu(BaseMenu):
     def __init__(self, stdscr, parent_menu=None):
         log_message("Initializing config menu...")
@@ -43,162 +53,129 @@ class ConfigMenu(BaseMenu):
             "Back to Main Menu"
         ]
         self.theme_selection = 0
+        self._theme_list = ()  # Theme names, captured when the theme menu opens
         self.in_theme_menu = False
         self.in_vm_selection = False
         self.vm_list = []
-        self.cached_messages = []  # For log messages
-        self.config_messages = []  # For config feedback
+        self._vm_max_name_len = 10   # Longest VM name in vm_list, for padding
+        self._vm_display_items = []  # vm_list plus the spacer and Back entries
+        self.config_messages = deque(maxlen=4)  # For config feedback, last 4 only
         log_message("Config menu initialization complete")
 
     def draw(self):
-        """Draw the configuration menu."""
-        # Clear all windows
-        self.main_window.clear()
-        self.config_window.clear()
-        self.status_window.clear()
-
-        # Get current theme directly from THEMES
-        theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
+        """Draw the configuration menu, repainting only the windows that changed."""
+        # Get any new messages
+        self.cached_messages.extend(msg for _, msg in drain_status_log())
         
+        # The selection is left out so moving it repaints just two rows, not the window
+        main_frame = (
+            theme_version(),
+            self.in_theme_menu,
+            self.in_vm_selection,
+            self._theme_list if self.in_theme_menu else (),
+            tuple((vm.get('id'), vm.get('name')) for vm in self.vm_list) if self.in_vm_selection else (),
+            hidden_vms_version()
+        )
+        selected = self.option_items()[1]
+        prev_row = self._drawn_regions.get('row')
+        if self.region_changed('main', main_frame):
+            self.draw_main_window()
+            self._drawn_regions['row'] = selected
+        elif self.region_changed('row', selected):
+            for idx in (prev_row, selected):
+                if idx is not None:
+                    self._draw_option_row(idx)
+            self.main_window.noutrefresh()
+        if self.region_changed('config', tuple(self.config_messages)):
+            self.draw_config_window()
+        log_tail = tuple(self.tail(self.cached_messages, 8))
+        if self.region_changed('log', log_tail):
+            self.draw_log_window(log_tail)
+        curses.doupdate()
+
+    def draw_main_window(self):
+        """Draw the title, navigation bar and the active option list."""
+        self.main_window.erase()
+
         # Draw title with theme colors
-        max_y, max_x = self.main_window.getmaxyx()
-        title = "Configuration Menu"
-        x = max_x//2 - len(title)//2
-        self.main_window.attron(curses.color_pair(1))  # Use basic text color
-        self.main_window.addstr(0, x, title, curses.A_BOLD)
-        self.main_window.attroff(curses.color_pair(1))
+        self.main_window.attron(theme_attrs.CP_TEXT)  # Use basic text color
+        self.main_window.addstr(0, self._title_x, TITLE, curses.A_BOLD)
+        self.main_window.attroff(theme_attrs.CP_TEXT)
         
-        # Draw main window content
-        max_y, max_x = self.main_window.getmaxyx()
-        
-        # Common navigation bar for all menus
-        if self.in_theme_menu:
-            title = "Select Theme"
-            navigation = "↑/↓: Navigate | Enter: Select | q: Cancel"
-        elif self.in_vm_selection:
-            title = "Hide/Show VMs"
-            navigation = "↑/↓: Navigate | Enter: Toggle Visibility"
-        else:
-            title = "Configuration Menu"
-            navigation = "↑/↓: Navigate | Enter: Select | q: Exit"
-
-        # Draw title and navigation
-        x = max_x//2 - len(navigation)//2
+        # Navigation bar for the current mode, centered in cache_window_sizes
+        navigation, x = self._navigation[self.current_mode()]
         self.main_window.addstr(1, x, navigation)
         
         # Draw separator
-        self.main_window.addstr(2, 0, "─" * max_x)
+        self.main_window.addstr(2, 0, self.separator)
+
+        # Draw the active option list
+        for idx in range(len(self.option_items()[0])):
+            self._draw_option_row(idx)
+
+        self.main_window.noutrefresh()
 
+    def option_items(self) -> tuple:
+        """Return the entries listed in the current mode and the selected index."""
         if self.in_theme_menu:
-            # Draw theme options
-            theme_list = list(THEMES.keys())
-            for idx, theme_name in enumerate(theme_list):
-                x = max_x//2 - len(theme_name)//2
-                y = max_y//2 - len(theme_list)//2 + idx + 2  # +2 for title and nav
-                
-                if idx == self.theme_selection:
-                    self.main_window.attron(curses.A_REVERSE)
-                try:
-                    self.main_window.addstr(y, x, theme_name)
-                except curses.error:
-                    pass  # Skip if can't draw
-                if idx == self.theme_selection:
-                    self.main_window.attroff(curses.A_REVERSE)
-        elif self.in_vm_selection:
-            # Draw VM options
-            # Find longest VM name for padding
-            max_name_length = max(len(vm.get('name', 'Unknown')) for vm in self.vm_list)
-            
-            # Calculate left margin to center the list as a whole
-            list_width = max_name_length + 4  # 4 for "[ ] " prefix
-            left_margin = (max_x - list_width) // 2
-            
-            # Draw VMs and Back option
-            display_items = self.vm_list + [None, {"name": "Back to Config Menu"}]  # Add None for spacing
-            
-            for idx, item in enumerate(display_items):
-                if item is None:  # Skip the spacing line
-                    continue
-                    
-                if idx < len(self.vm_list):  # Regular VM entry
-                    vm = item
-                    vm_name = vm.get('name', 'Unknown')
-                    vm_id = vm.get('id')
-                    prefix = "[H]" if vm_id in hidden_vms else "[ ]"
-                    display_name = f"{prefix} {vm_name:<{max_name_length}}"
-                    y = max_y//2 - len(display_items)//2 + idx + 2  # +2 for title and nav
-                    
-                    if idx == self.current_row:
-                        self.main_window.attron(curses.A_REVERSE)
-                    self.main_window.addstr(y, left_margin, display_name)
-                    if idx == self.current_row:
-                        self.main_window.attroff(curses.A_REVERSE)
-                else:  # Back option
-                    display_name = "Back to Config Menu"
-                    # Center the back option
-                    x = max_x//2 - len(display_name)//2
-                    y = max_y//2 - len(display_items)//2 + idx + 2  # +2 for title and nav
-                    
-                    if idx == self.current_row:
-                        self.main_window.attron(curses.A_REVERSE)
-                    self.main_window.addstr(y, x, display_name)
-                    if idx == self.current_row:
-                        self.main_window.attroff(curses.A_REVERSE)
+            return self._theme_list, self.theme_selection
+        if self.in_vm_selection:
+            return self._vm_display_items, self.current_row  # VMs, a spacer (None) and Back
+        return self.options, self.current_row
+
+    def _draw_option_row(self, idx: int):
+        """Draw one entry of the active option list, highlighted if it is selected."""
+        items, selected = self.option_items()
+        if idx >= len(items) or items[idx] is None:  # Past the end, or the spacing line
+            return
+        max_y, max_x = self.main_size
+        item = items[idx]
+        if self.in_vm_selection and idx < len(self.vm_list):
+            # VM rows are padded to the longest name and the list is centered as a whole
+            prefix = "[H]" if item.get('id') in hidden_vms else "[ ]"
+            text = f"{prefix} {item.get('name', 'Unknown'):<{self._vm_max_name_len}}"
+            x = (max_x - (self._vm_max_name_len + 4)) // 2  # 4 for "[ ] " prefix
         else:
-            # Draw main config options
-            for idx, option in enumerate(self.options):
-                x = max_x//2 - len(option)//2
-                y = max_y//2 - len(self.options)//2 + idx + 2  # +2 for title and nav
-                
-                if idx == self.current_row:
-                    self.main_window.attron(curses.A_REVERSE)
-                self.main_window.addstr(y, x, option)
-                if idx == self.current_row:
-                    self.main_window.attroff(curses.A_REVERSE)
+            text = "Back to Config Menu" if self.in_vm_selection else item
+            x = max_x//2 - len(text)//2
+        y = max_y//2 - len(items)//2 + idx + 2  # +2 for title and nav
+        try:
+            self.main_window.addstr(y, x, text, curses.A_REVERSE if idx == selected else curses.A_NORMAL)
+        except curses.error:
+            pass  # Skip if can't draw
 
-        # Draw config messages window
+    def draw_config_window(self):
+        """Draw the last few config feedback messages."""
+        self.config_window.erase()
         self.config_window.box()
         self.config_window.addstr(0, 2, " Config Messages ")
         
         # Draw last 4 config messages
-        for i, msg in enumerate(self.config_messages[-4:]):
-            if i < 4:
-                self.config_window.addstr(i + 1, 2, msg[:self.config_window.getmaxyx()[1]-4])
+        for i, msg in enumerate(self.config_messages):
+            self.config_window.addstr(i + 1, 2, msg[:self.pane_width])
 
-        # Draw status window and logs
+        self.config_window.noutrefresh()
+
+    def draw_log_window(self, log_tail):
+        """Draw the most recent log messages, newest first."""
+        self.status_window.erase()
         self.status_window.box()
         self.status_window.addstr(0, 2, " Log Messages ")
         
-        # Get any new messages
-        while True:
-            try:
-                msg = status_log.get_nowait()
-                self.cached_messages.append(msg)
-            except Empty:
-                break
-            except:
-                break
-        
-        # Draw messages
-        max_x = self.status_window.getmaxyx()[1] - 4
-        messages_to_show = self.cached_messages[-8:] if self.cached_messages else []
-        
-        for i, msg in enumerate(reversed(messages_to_show)):
-            try:
-                self.status_window.addstr(i + 1, 2, msg[:max_x])
-            except curses.error:
-                pass
+        # Draw messages newest first: walk oldest to newest and place each from the bottom up
+        max_x = self.pane_width
+        n = len(log_tail)
+        try:
+            for i, msg in enumerate(log_tail):
+                self.status_window.addstr(n - i, 2, msg[:max_x])
+        except curses.error:
+            pass
 
-        # Refresh all windows
-        self.main_window.refresh()
-        self.config_window.refresh()
-        self.status_window.refresh()
+        self.status_window.noutrefresh()
 
     def add_config_message(self, message: str):
         """Add a message to the config messages window."""
-        self.config_messages.append(message)
-        if len(self.config_messages) > 4:
-            self.config_messages = self.config_messages[-4:]
+        self.config_messages.append(message)  # deque drops the oldest
 
     def handle_input(self, key) -> bool:
         """Handle user input in the config menu."""
@@ -220,20 +197,7 @@ class ConfigMenu(BaseMenu):
         """Apply theme change and redraw all windows."""
         try:
             if change_theme(new_theme):
-                # Reinitialize colors
-                initialize_theme_colors()
-                
-                # Apply theme to parent menu first
-                if self.parent_menu:
-                    self.parent_menu.apply_theme()
-                
-                # Apply to config menu
-                self.apply_theme()
-                
-                # Force complete redraw
-                self.draw()
-                curses.doupdate()
-                
+                self.refresh_theme_colors()
                 self.add_config_message(f"Theme changed to: {new_theme}")
             else:
                 self.add_config_message("Failed to change theme")
@@ -244,7 +208,7 @@ class ConfigMenu(BaseMenu):
 
     def handle_theme_input(self, key) -> bool:
         """Handle input in the theme selection menu."""
-        theme_list = list(THEMES.keys())  # Use THEMES directly instead of self.themes
+        theme_list = self._theme_list
         if key == curses.KEY_UP and self.theme_selection > 0:
             self.theme_selection -= 1
         elif key == curses.KEY_DOWN and self.theme_selection < len(theme_list) - 1:
@@ -280,12 +244,10 @@ class ConfigMenu(BaseMenu):
                 vm = self.vm_list[self.current_row]
                 vm_id = vm.get('id')
                 if vm_id:
-                    if vm_id in hidden_vms:
-                        hidden_vms.remove(vm_id)
-                        self.add_config_message(f"Showing VM: {vm.get('name')}")
-                    else:
-                        hidden_vms.add(vm_id)
+                    if toggle_hidden_vm(vm_id):
                         self.add_config_message(f"Hiding VM: {vm.get('name')}")
+                    else:
+                        self.add_config_message(f"Showing VM: {vm.get('name')}")
         return True
 
     def execute_option(self) -> bool:
@@ -293,41 +255,43 @@ class ConfigMenu(BaseMenu):
         if self.options[self.current_row] == "Back to Main Menu":
             return False
         elif self.options[self.current_row] == "Hide/Show VMs":
+            log_message("Fetching VM list for visibility settings...")
+            vm_list = get_vm_list()  # Network I/O stays outside the lock
             with menu_lock:
-                log_message("Fetching VM list for visibility settings...")
-                self.vm_list = get_vm_list()
+                self.vm_list = vm_list
+                self._vm_max_name_len = max((len(vm.get('name', 'Unknown')) for vm in vm_list), default=10)
+                self._vm_display_items = vm_list + [None, {"name": "Back to Config Menu"}]  # Add None for spacing
                 self.in_vm_selection = True
                 self.current_row = 0  # Reset selection to first VM
                 self.add_config_message("Select VMs to hide/show using Enter")
                 return True
         elif self.options[self.current_row] == "Change Theme":
             self.in_theme_menu = True
+            # Themes only change from this menu's other options, so snapshot the names now
+            self._theme_list = tuple(get_themes())
             self.theme_selection = 0
             self.add_config_message("Select a theme using arrow keys")
         elif self.options[self.current_row] == "Invert Background":
-            global INVERT_BACKGROUND
-            INVERT_BACKGROUND = not INVERT_BACKGROUND
-            state = "enabled" if INVERT_BACKGROUND else "disabled"
+            enabled = self.toggle_inversion('invert_background')
+            state = "enabled" if enabled else "disabled"
             self.add_config_message(f"Background inversion {state}")
         elif self.options[self.current_row] == "Invert Text":
-            global INVERT_TEXT
-            INVERT_TEXT = not INVERT_TEXT
-            state = "enabled" if INVERT_TEXT else "disabled"
+            enabled = self.toggle_inversion('invert_text')
+            state = "enabled" if enabled else "disabled"
             self.add_config_message(f"Text inversion {state}")
         elif self.options[self.current_row] == "Generate Random Theme":
             new_theme = generate_random_theme()
-            THEMES["random_current"] = new_theme
+            get_themes()["random_current"] = new_theme
             change_theme("random_current")
-            initialize_theme_colors()
-            self.parent_menu.apply_theme()  # Apply to parent menu
-            self.apply_theme()  # Apply to config menu
+            self.refresh_theme_colors()
             self.add_config_message("Generated random theme. Use 'Save Current Theme' to keep it.")
         elif self.options[self.current_row] == "Save Current Theme":
             # Get current theme data
-            current = THEMES.get(get_current_theme())
+            themes = get_themes()
+            current = themes.get(get_current_theme())
             if current:
                 # Prompt for name
-                name = "custom_" + str(len(THEMES))  # Simple naming for now
+                name = "custom_" + str(len(themes))  # Simple naming for now
                 if save_custom_theme(current, name):
                     self.add_config_message(f"Theme saved as: {name}")
                 else:
@@ -336,12 +300,45 @@ class ConfigMenu(BaseMenu):
             self.show_delete_theme_menu()  # You'll need to implement this
         return True
 
+    def toggle_inversion(self, key: str) -> bool:
+        """Flip an inversion setting, save it, and rebuild the color pairs once."""
+        enabled = not config.get(key, False)
+        config.settings[key] = enabled  # Settings saves on change
+        self.refresh_theme_colors()
+        return enabled
+
+    def refresh_theme_colors(self) -> None:
+        """Rebuild the color pairs once and re-theme the parent menu, then this one."""
+        initialize_theme_colors()
+        if self.parent_menu:
+            self.parent_menu.apply_theme()
+        self.apply_theme()  # Config menu repaints on the next frame
+
     def get_theme_name(self):
         """Prompt user for theme name."""
         # Implement a text input dialog
         # Return the name or None if cancelled
         pass
 
+    def current_mode(self) -> str:
+        """Return which list the menu is showing: 'theme', 'vm' or 'main'."""
+        if self.in_theme_menu:
+            return 'theme'
+        if self.in_vm_selection:
+            return 'vm'
+        return 'main'
+
+    def cache_window_sizes(self):
+        """Also center the title and each navigation bar, which only move when the width changes."""
+        super().cache_window_sizes()
+        max_x = self.main_size[1]
+        self._title_x = max_x//2 - len(TITLE)//2
+        self._navigation = {mode: (text, max_x//2 - len(text)//2) for mode, text in NAVIGATION.items()}
+
+    def themed_windows(self) -> tuple:
+        """Every window, including the config messages window."""
+        return (self.main_window, self.config_window, self.status_window)
+
     def show_delete_theme_menu(self):
         """Show menu of custom themes that can be deleted."""
         # Implement a menu showing only custom themes
@@ -364,16 +361,9 @@ class ConfigMenu(BaseMenu):
             self.main_window.keypad(1)
             self.config_window = curses.newwin(config_height, width - 4, main_height + 2, 2)
             self.status_window = curses.newwin(status_height, width - 4, main_height + 8, 2)
-            
-            # Apply theme background to all windows
-            theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
-            attr = curses.color_pair(1)  # Use color pair 1 for basic text
-            if theme["use_bold"]:
-                attr |= curses.A_BOLD
-            
-            self.main_window.bkgd(' ', attr)
-            self.config_window.bkgd(' ', attr)
-            self.status_window.bkgd(' ', attr)
+            self.cache_window_sizes()
+            self.apply_background()
+            self.mark_dirty()  # New windows start blank
             
             log_message("Windows created and themed")
             
@@ -1,27 +1,42 @@
 import curses
+from itertools import islice
 from typing import Optional
+from ..config import themes as theme_attrs  # CP_* color attributes
 from ..utils.logging import log_message
-from ..config.settings import (
-    status_log, 
-    hidden_vms
-)
+from ..config.settings import hidden_vms, hidden_vms_version
 from ..config.themes import (
-    get_themes,
-    get_current_theme,  # Get theme functions from themes.py
-    initialize_theme_colors,
-    THEMES  # Add this import
+    theme_version,
+    initialize_theme_colors
 )
 from ..api.vm_get import get_vm_list
 from .vm_menu import VMMenu
 from ..utils.lock import menu_lock
-from queue import Empty  # Add this import at the top
 from .base_menu import BaseMenu
 
+# Short labels for API power states, and the power cell text drawn for each
+_DISPLAY_STATUS = {'poweredon': 'On', 'poweredoff': 'Off', 'suspended': 'Sus'}
+_STATUS_CELL = {state: f"[{label:^3}]" for state, label in _DISPLAY_STATUS.items()}
+# Color pair attribute for each power state. Names, not values, because the
+# CP_* attributes are rebuilt whenever the theme changes.
+_POWER_CELL_COLOR = {'poweredon': 'CP_ON', 'poweredoff': 'CP_OFF'}
+_STATUS_COLOR = {**_POWER_CELL_COLOR, 'suspended': 'CP_SELECTED'}
+
+TITLE = "VMware Manager"
+INSTRUCTIONS = "↑/↓: Navigate | Enter: Select | c: Config | q: Quit"
+
 class MainMenu(BaseMenu):
+    # VM list layout within the main window
+    LIST_TOP = 3
+    NAME_COL_X = 3
+    POWER_COL_X = NAME_COL_X + 40
+
     def __init__(self, stdscr):
         super().__init__(stdscr)  # This sets up themed windows
         self.current_row = 0
         self.vm_list = []
+        self._drawn_power_states = ()  # Power states currently on screen
+        self._visible_cache = None      # (vm_list, hidden version, VMs not hidden), see visible_vms
+        self._list_summary = None       # (vm_list, (id, name) rows, power states), see list_summary
         self.draw_empty_screen()
 
     def setup_windows(self):
@@ -36,28 +51,45 @@ class MainMenu(BaseMenu):
         self.main_window.keypad(1)
         self.api_window = curses.newwin(api_height, width - 4, main_height + 2, 2)
         self.status_window = curses.newwin(status_height, width - 4, main_height + api_height + 2, 2)
+        self.cache_window_sizes()
         
-        # Apply theme background
-        theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
-        attr = curses.color_pair(1)
-        if theme.get("use_bold", True):
-            attr |= curses.A_BOLD
-        
-        for window in [self.main_window, self.api_window, self.status_window]:
-            window.bkgd(' ', attr)
+        # The message lines live in pads, so a new message doesn't redraw the pane border
+        self.api_pad, self.api_pad_area = self.create_pane_pad(self.api_window, api_height - 2)
+        self.log_pad, self.log_pad_area = self.create_pane_pad(self.status_window, status_height - 2)
+        self.apply_background()
+
+    def cache_window_sizes(self):
+        """Also center the title and instructions, which only move when the width changes."""
+        super().cache_window_sizes()
+        max_y, max_x = self.main_size
+        self._list_rows = max(0, max_y - self.LIST_TOP)  # VM rows that fit below the header
+        # Clamped so a narrow window still starts them on screen
+        self._title_x = max(0, min(max_x//2 - len(TITLE)//2, max_x - len(TITLE)))
+        self._instructions_x = max(0, min(max_x//2 - len(INSTRUCTIONS)//2, max_x - len(INSTRUCTIONS)))
+
+    def themed_windows(self) -> tuple:
+        """Every window and pane pad."""
+        return (self.main_window, self.api_window, self.status_window, self.api_pad, self.log_pad)
 
     def refresh_vm_list(self, force: bool = False):
         """Refresh the list of VMs."""
-        # This entire method should be called with menu_lock held
-        old_count = len(self.vm_list)
+        self.set_vm_list(self._fetch_vm_list_unlocked(force))
+
+    def _fetch_vm_list_unlocked(self, force: bool = False) -> list:
+        """Fetch the VM list from the API. Safe to call without menu_lock."""
         log_message(f"Starting VM list refresh (force={force})...", refresh=True)
-        
+        return get_vm_list(force)
+
+    def set_vm_list(self, vm_list: list):
+        """Swap in a new VM list and schedule a redraw. Call with menu_lock held."""
+        old_count = len(self.vm_list)
         try:
-            self.vm_list = get_vm_list(force)
-            new_count = len(self.vm_list)
-            log_message(f"VM list refresh complete. VMs: {old_count} -> {new_count}", refresh=True)
+            self.vm_list = vm_list
+            self._visible_cache = None
+            self._list_summary = None
+            log_message(f"VM list refresh complete. VMs: {old_count} -> {len(vm_list)}", refresh=True)
         finally:
-            self.draw_screen()
+            self.request_draw()
 
     def handle_input(self, key) -> Optional[VMMenu]:
         """Handle keyboard input."""
@@ -73,141 +105,167 @@ class MainMenu(BaseMenu):
 
     def get_display_status(self, status: str) -> str:
         """Convert API status to display status."""
-        status = status.lower()
-        if status == 'poweredon':
-            return 'On'
-        elif status == 'poweredoff':
-            return 'Off'
-        elif status == 'suspended':
-            return 'Sus'
-        return '???'
+        return _DISPLAY_STATUS.get(status.lower(), '???')
 
-    def draw_screen(self):
-        """Draw the main interface."""
-        if self.vm_list:
-            self.main_window.clear()
-            
-            # Draw main window border
-            self.draw_box(self.main_window)
-            
-            # Get current theme directly from THEMES
-            theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
-            
-            # Draw title and instructions
-            max_y, max_x = self.main_window.getmaxyx()
-            title = "VMware Manager"
-            instructions = "↑/↓: Navigate | Enter: Select | c: Config | q: Quit"
-            
-            # Draw title with theme colors
-            x = max_x//2 - len(title)//2
-            self.main_window.attron(curses.color_pair(1))
-            self.main_window.addstr(0, x, title, curses.A_BOLD)
-            self.main_window.attroff(curses.color_pair(1))
-            
-            # Add instructions below title
-            x = max_x//2 - len(instructions)//2
-            self.main_window.addstr(1, x, instructions)
-            
-            # Draw separator
-            self.main_window.addstr(2, 0, "─" * max_x)
+    def visible_vms(self) -> list:
+        """Return the VMs that aren't hidden, reusing the last result until the list or hidden set changes."""
+        cache = self._visible_cache
+        version = hidden_vms_version()
+        if cache is None or cache[0] is not self.vm_list or cache[1] != version:
+            cache = self._visible_cache = (
+                self.vm_list, version, [vm for vm in self.vm_list if vm.get('id') not in hidden_vms]
+            )
+        return cache[2]
 
-            # Draw VM list
-            visible_vms = [vm for vm in self.vm_list if vm.get('id') not in hidden_vms]
-            
-            name_start = 3
-            status_start = name_start + 40
+    def list_summary(self) -> tuple:
+        """Return the (id, name) rows and power states of vm_list, rebuilt only when the list is replaced.
 
-            for idx, vm in enumerate(visible_vms):
-                if idx + 3 >= max_y:
-                    break
-                
-                vm_name = vm.get('name', 'Unknown VM')
-                status = vm.get('power_state', 'UNKNOWN')
-                display_status = self.get_display_status(status)
-                
-                y_pos = idx + 3
-                
-                if idx == self.current_row:
-                    # Selected item - just add a space before the name
-                    self.main_window.addstr(y_pos, 2, " ")  # Single space indent
-                    self.main_window.attron(curses.A_REVERSE)
-                    self.main_window.addstr(y_pos, name_start, vm_name)
-                    self.main_window.attroff(curses.A_REVERSE)
-                else:
-                    # Non-selected item - just add a space before the name
-                    self.main_window.addstr(y_pos, 2, " ")  # Single space indent
-                    self.main_window.addstr(y_pos, name_start, vm_name)
-                
-                # Use theme colors for power states
-                if status.lower() == 'poweredon':
-                    self.main_window.attron(curses.color_pair(2))  # Green
-                    self.main_window.addstr(y_pos, status_start, f"[{display_status:^3}]")
-                    self.main_window.attroff(curses.color_pair(2))
-                elif status.lower() == 'poweredoff':
-                    self.main_window.attron(curses.color_pair(3))  # Red
-                    self.main_window.addstr(y_pos, status_start, f"[{display_status:^3}]")
-                    self.main_window.attroff(curses.color_pair(3))
-
-            self.main_window.refresh()
+        The list is never changed in place (new lists come in through set_vm_list),
+        so holding a reference to it is enough to tell when the summary is stale.
+        """
+        cache = self._list_summary
+        if cache is None or cache[0] is not self.vm_list:
+            vm_list = self.vm_list
+            cache = self._list_summary = (
+                vm_list,
+                tuple((vm.get('id'), vm.get('name')) for vm in vm_list),
+                tuple(vm.get('power_state') for vm in vm_list)
+            )
+        return cache[1], cache[2]
 
+    def draw_screen(self):
+        """Draw the main interface."""
         # Collect any new messages
         self.collect_messages()
         
-        # Draw API window with border
-        self.api_window.clear()
-        self.draw_box(self.api_window)
-        self.api_window.addstr(0, 2, " API Calls ")
+        # Skip all curses writes when nothing visible has changed, and only
+        # repaint the power column when that's the only thing that changed
+        rows, power_states = self.list_summary()
+        list_frame = (theme_version(), rows, hidden_vms_version())
+        api_tail = tuple(self.api_lines)
+        log_tail = tuple(self.tail(self.log_messages, 8))
+        if not self.frame_changed((list_frame, self.current_row, api_tail, log_tail)):
+            if power_states is not self._drawn_power_states:
+                self.draw_power_column()
+                curses.doupdate()
+            return
         
-        # Show API messages
-        max_x = self.api_window.getmaxyx()[1] - 4
-        for i, msg in enumerate(self.api_messages[-6:]):
-            try:
-                # Extract timestamp and API call
-                parts = msg.split(" - ", 2)  # Split into [level, timestamp, message]
-                if len(parts) >= 3:
-                    # Get timestamp without milliseconds
-                    timestamp = parts[1].strip()  # e.g., "14:22:04"
-                    api_call = parts[2].replace("API CALL: ", "").strip()
-                    formatted_msg = f"{timestamp}  {api_call}"
-                    self.api_window.addstr(i + 1, 2, formatted_msg[:max_x])
-                else:
-                    # Fallback - show raw message if parsing fails
-                    self.api_window.addstr(i + 1, 2, msg[:max_x])
-            except curses.error:
-                pass
+        # Repaint only the windows whose contents changed, then flush them in one update
+        if self.vm_list:
+            prev_row = self._drawn_regions.get('row')
+            if self.region_changed('list', list_frame):
+                self.draw_vm_list()
+                self._drawn_regions['row'] = self.current_row
+            else:
+                if self.region_changed('row', self.current_row):
+                    # Only the selection moved, so repaint just the old and new rows
+                    visible_vms = self.visible_vms()
+                    max_rows = min(len(visible_vms), self._list_rows)
+                    for idx in (prev_row, self.current_row):
+                        if idx is not None and idx < max_rows:
+                            self._draw_vm_row(idx, visible_vms[idx])
+                # Power states often change in the same wake as new API or log lines
+                if power_states is not self._drawn_power_states:
+                    self.draw_power_column()
+            self.main_window.noutrefresh()
+
+        if self.region_changed('api', api_tail):
+            self.draw_api_window(api_tail)
+        if self.region_changed('log', log_tail):
+            self.draw_log_window(log_tail)
+        curses.doupdate()
+
+    def draw_vm_list(self):
+        """Repaint the main window: title, instructions and every VM row."""
+        self.main_window.erase()
+        
+        # Draw main window border
+        self.draw_box(self.main_window)
+        
+        # Draw title with theme colors, then the instructions below it
+        self.main_window.addstr(0, self._title_x, TITLE, theme_attrs.CP_TEXT | curses.A_BOLD)
+        self.main_window.addstr(1, self._instructions_x, INSTRUCTIONS)
         
-        self.api_window.refresh()
+        # Draw separator
+        self.main_window.addstr(2, 0, self.separator)
+
+        # Draw VM list
+        for idx, vm in enumerate(islice(self.visible_vms(), self._list_rows)):
+            self._draw_vm_row(idx, vm)
         
-        # Draw status window with border
-        self.status_window.clear()
-        self.draw_box(self.status_window)
-        self.status_window.addstr(0, 2, " Log Messages ")
+        self._drawn_power_states = self.list_summary()[1]
+
+    def _draw_vm_row(self, idx: int, vm: dict):
+        """Draw one VM row, highlighted if it is the current row. Callers check it fits."""
+        y_pos = idx + self.LIST_TOP
+        # The indent before the name stays blank from erase(), so only the name is written
+        name_attr = curses.A_REVERSE if idx == self.current_row else curses.A_NORMAL
+        self.main_window.addstr(y_pos, self.NAME_COL_X, vm.get('name', 'Unknown VM'), name_attr)
+        self._draw_power_cell(y_pos, vm.get('power_state', 'UNKNOWN'))
+
+    def draw_api_window(self, api_tail):
+        """Repaint the API calls window."""
+        # The border only needs drawing after a full repaint was requested
+        if self.region_changed('api_frame', True):
+            self.api_window.erase()
+            self.draw_box(self.api_window)
+            self.api_window.addstr(0, 2, " API Calls ")
+            self.api_window.noutrefresh()
+        
+        # Show API messages, already formatted by collect_messages. The pad
+        # is sized to the tail, so every line fits.
+        max_x = self.pane_width
+        self.api_pad.erase()
+        for i, line in enumerate(api_tail):
+            self.api_pad.addstr(i, 0, line[:max_x])
+        self.show_pane_pad(self.api_pad, self.api_pad_area)
+
+    def draw_log_window(self, log_tail):
+        """Repaint the log messages window."""
+        if self.region_changed('log_frame', True):
+            self.status_window.erase()
+            self.draw_box(self.status_window)
+            self.status_window.addstr(0, 2, " Log Messages ")
+            self.status_window.noutrefresh()
         
         # Show log messages
-        max_x = self.status_window.getmaxyx()[1] - 4
-        for i, msg in enumerate(self.log_messages[-8:]):
+        max_x = self.pane_width
+        self.log_pad.erase()
+        for i, msg in enumerate(log_tail):
+            self.draw_colored_message(self.log_pad, i, 0, msg, max_x)
+        self.show_pane_pad(self.log_pad, self.log_pad_area)
+
+    def _draw_power_cell(self, y_pos: int, status: str):
+        """Draw the power state cell for one VM row."""
+        state = status.lower()
+        color = _POWER_CELL_COLOR.get(state)
+        if color is None:
+            # Blank the cell so a previous state doesn't linger
+            self.main_window.addstr(y_pos, self.POWER_COL_X, " " * 5)
+            return
+        self.main_window.addstr(y_pos, self.POWER_COL_X, _STATUS_CELL[state], getattr(theme_attrs, color))
+
+    def draw_power_column(self):
+        """Redraw only the power state cells, for when nothing else has changed."""
+        if not self.vm_list:
+            return
+        for idx, vm in enumerate(islice(self.visible_vms(), self._list_rows)):
             try:
-                self.draw_colored_message(self.status_window, i + 1, 2, msg, max_x)
+                self._draw_power_cell(idx + self.LIST_TOP, vm.get('power_state', 'UNKNOWN'))
             except curses.error:
                 pass
         
-        self.status_window.refresh()
+        self._drawn_power_states = self.list_summary()[1]
+        self.main_window.noutrefresh()  # Caller flushes with curses.doupdate()
 
     def get_status_color(self, status: str) -> int:
         """Get the color pair for a VM status."""
-        theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
-        status = status.lower()
-        
-        if status == 'poweredon':
-            return curses.color_pair(2)  # Uses theme's powered_on color
-        elif status == 'poweredoff':
-            return curses.color_pair(3)  # Uses theme's powered_off color
-        elif status == 'suspended':
-            return curses.color_pair(4)  # Could add suspended color to themes
-        return curses.color_pair(1)  # Default theme text color
+        # Suspended uses the selection color until themes define one for it
+        return getattr(theme_attrs, _STATUS_COLOR.get(status.lower(), 'CP_TEXT'))
 
     def draw_empty_screen(self):
-        """Draw initial empty screen with borders and basic layout."""
+        """Draw initial empty screen with borders and basic layout. Caller flushes with curses.doupdate()."""
+        self.mark_dirty()  # Windows get cleared, so the next draw_screen must repaint
         try:
             # Clear everything first
             self.stdscr.clear()
@@ -215,9 +273,8 @@ class MainMenu(BaseMenu):
             self.api_window.clear()
             self.status_window.clear()
             
-            # Get current theme colors and window dimensions
-            theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
-            max_y, max_x = self.main_window.getmaxyx()
+            # Get window dimensions
+            max_y, max_x = self.main_size
             
             # Ensure we have enough space
             if max_y < 5 or max_x < 20:  # Minimum size check
@@ -226,17 +283,13 @@ class MainMenu(BaseMenu):
             
             try:
                 self.main_window.box()
-                title = "VMware Manager"
-                instructions = "↑/↓: Navigate | Enter: Select | c: Config | q: Quit"
                 
-                # Safe string drawing with bounds checking
-                x = max(0, min(max_x//2 - len(title)//2, max_x - len(title)))
-                self.main_window.attron(curses.color_pair(1))
-                self.main_window.addstr(0, x, title[:max_x-1], curses.A_BOLD)
-                self.main_window.attroff(curses.color_pair(1))
+                # Safe string drawing, positions are clamped in cache_window_sizes
+                self.main_window.attron(theme_attrs.CP_TEXT)
+                self.main_window.addstr(0, self._title_x, TITLE[:max_x-1], curses.A_BOLD)
+                self.main_window.attroff(theme_attrs.CP_TEXT)
                 
-                x = max(0, min(max_x//2 - len(instructions)//2, max_x - len(instructions)))
-                self.main_window.addstr(1, x, instructions[:max_x-1])
+                self.main_window.addstr(1, self._instructions_x, INSTRUCTIONS[:max_x-1])
                 
                 # Try Unicode separator first, fall back to ASCII if it fails
                 try:
@@ -251,17 +304,16 @@ class MainMenu(BaseMenu):
                 log_title = " Log Messages "
                 
                 self.draw_box(self.api_window)
-                self.api_window.addstr(0, 2, api_title[:self.api_window.getmaxyx()[1]-4])
+                self.api_window.addstr(0, 2, api_title[:self.pane_width])
                 
                 self.draw_box(self.status_window)
-                self.status_window.addstr(0, 2, log_title[:self.status_window.getmaxyx()[1]-4])
+                self.status_window.addstr(0, 2, log_title[:self.pane_width])
                 
-                # Force refresh of all windows
+                # Stage all windows for the caller's update
                 self.stdscr.noutrefresh()
                 self.main_window.noutrefresh()
                 self.api_window.noutrefresh()
                 self.status_window.noutrefresh()
-                curses.doupdate()
                 
             except curses.error as e:
                 log_message(f"Curses error in draw_empty_screen: {str(e)}", "ERROR")
@@ -270,30 +322,21 @@ class MainMenu(BaseMenu):
             log_message(f"Error in draw_empty_screen: {str(e)}", "ERROR")
 
     def apply_theme(self) -> None:
-        """Apply current theme and redraw."""
-        self.stdscr.clear()
-        self.main_window.clear()
-        self.api_window.clear()  # Clear API window
-        self.status_window.clear()
-        self.draw_empty_screen()
-        self.draw_screen()
-        curses.doupdate()
+        """Apply current theme; the UI loop repaints on the next frame."""
+        self.update_theme()
+        self.apply_background()
+        self.mark_dirty()
+        self.request_draw()
 
     def handle_theme_change(self):
         """Handle theme changes by reinitializing colors and redrawing."""
         initialize_theme_colors()
-        self.current_theme = get_themes()[get_current_theme()]
-        
-        # Clear all windows
-        self.stdscr.clear()
-        self.main_window.clear()
-        self.api_window.clear()  # Clear API window
-        self.status_window.clear()
+        self.update_theme()
         
-        # Redraw everything
-        self.draw_empty_screen()
-        self.draw_screen()
+        # Clear all windows so every cell is resent in the new colors
+        for window in (self.main_window, self.api_window, self.status_window):
+            window.clear()
         
-        # Force update
-        self.stdscr.refresh()
-        curses.doupdate() 
\ No newline at end of file
+        # One full redraw; draw_screen repaints the title and borders when dirty
+        self.mark_dirty()
+        self.draw_screen()  # Flushes with a single curses.doupdate()
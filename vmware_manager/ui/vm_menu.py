@@ -1,21 +1,35 @@
 import curses
+import queue
+import textwrap
+from collections import deque
+from functools import partial
 from typing import Dict, Optional
 from ..api.vm_get import get_vm_details, get_vm_power_state
 from ..api.vm_put import vm_action
+from ..config import themes as theme_attrs  # CP_* color attributes
+from ..config.themes import theme_version
 from ..utils.logging import log_message
-from ..config.settings import status_log
-from ..config.themes import THEMES, get_current_theme
+from ..utils.wakeup import wake_ui
+from ..utils.workers import WorkerPool
 import time
-from queue import Empty
 from .base_menu import BaseMenu
 
+NAVIGATION = "↑/↓: Navigate | Enter: Select | q: Back"
+
+# Shared by every VM menu for power actions and info fetches, shut down by cleanup_handler
+vm_workers = WorkerPool(max_workers=2, name="VMAction")
 
 class VMMenu(BaseMenu):
+    UPDATE_INTERVAL = 5       # Seconds between VM info fetches after a change
+    MAX_UPDATE_INTERVAL = 60  # Back-off cap while the power state holds steady
+    # Color pair attribute for each power state. Names, not values, because the
+    # CP_* attributes are rebuilt whenever the theme changes.
+    POWER_STATE_COLOR = {'poweredon': 'CP_ON', 'poweredoff': 'CP_OFF'}
+
     def __init__(self, stdscr, vm_id: str, vm_name: str):
-        super().__init__(stdscr)
+        # Set before the windows are built, cache_window_sizes lays these out
         self.vm_id = vm_id
         self.vm_name = vm_name
-        self.current_row = 0
         self.options = [
             "Start VM",
             "Shutdown VM",  # Graceful shutdown first
@@ -23,13 +37,20 @@ class VMMenu(BaseMenu):
             "Suspend VM",
             "Back to Main Menu"
         ]
-        self.cached_messages = []  # For log messages
-        self.vm_messages = []      # For VM-specific messages
-        self.api_messages = []     # For API requests/responses
-        self.last_update = 0  # Add timestamp for last update
-        self.update_interval = 5  # Update every 5 seconds
-        self.update_vm_info()  # Initial update
-        self.setup_windows()
+        super().__init__(stdscr)  # Also builds the windows
+        self.current_row = 0
+        # Sized to what each window shows, so a whole buffer is the tail to draw
+        self.vm_messages = deque(maxlen=3)  # For VM-specific messages, leaving room for status
+        self.api_messages = deque(maxlen=6)  # For API requests/responses
+        self.log_messages = deque(maxlen=3)  # Non-API messages, collect_messages fills it
+        self.vm_details = None
+        self.power_state = None
+        self.last_update = float('-inf')  # time.monotonic() of the last fetch started
+        self.update_interval = self.UPDATE_INTERVAL  # Doubles while the power state is unchanged
+        self._info_results = queue.SimpleQueue()  # (details, power_state) from fetch threads
+        self._info_pending = False  # A fetch thread is running
+        self._ui_updates = queue.SimpleQueue()  # Callables from worker threads, run by draw()
+        self.update_vm_info(time.monotonic())  # Initial update
 
     def setup_windows(self):
         """Initialize/reinitialize all windows."""
@@ -52,198 +73,216 @@ class VMMenu(BaseMenu):
         # Status window last
         self.status_window = curses.newwin(status_height, width - 4, main_height + vm_msg_height + api_height + 2, 2)
         
-        # Apply theme background
-        theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
-        attr = curses.color_pair(1)
-        if theme.get("use_bold", True):
-            attr |= curses.A_BOLD
-        
-        for window in [self.main_window, self.vm_messages_window, self.api_window, self.status_window]:
-            window.bkgd(' ', attr)
+        self.cache_window_sizes()
+        self.apply_background()
+
+    def cache_window_sizes(self):
+        """Also lay out the title, navigation and options, which only move when the size changes."""
+        super().cache_window_sizes()
+        max_y, max_x = self.main_size
+        self._title = f"VM: {self.vm_name}"
+        self._title_x = max_x//2 - len(self._title)//2
+        self._navigation_x = max_x//2 - len(NAVIGATION)//2
+        top = max_y//2 - len(self.options)//2
+        self._option_pos = [(top + idx, max_x//2 - len(option)//2) for idx, option in enumerate(self.options)]
+
+    def themed_windows(self) -> tuple:
+        """Every window, including the VM messages and API windows."""
+        return (self.main_window, self.vm_messages_window, self.api_window, self.status_window)
 
     def add_vm_message(self, message: str):
         """Add a message to the VM Messages window."""
-        self.vm_messages.append(message)
-        if len(self.vm_messages) > 4:  # Keep only last 4 messages
-            self.vm_messages = self.vm_messages[-4:]
+        self.vm_messages.append(message)  # deque drops the oldest
 
     def add_api_message(self, message: str):
         """Add a message to the API Messages window."""
+        self.add_api_messages([message])
+
+    def add_api_messages(self, messages: list):
+        """Add several messages to the API Messages window at once. Safe from any thread."""
+        self._post_update(partial(self._append_api_messages, messages))
+
+    def apply_ui_updates(self):
+        """Run the updates worker threads posted, on the UI thread."""
+        while not self._ui_updates.empty():
+            self._ui_updates.get()()
+
+    def _append_api_messages(self, messages: list):
+        """Wrap messages to the pane width and add them to the API buffer."""
         # Get window width for wrapping
-        max_width = self.api_window.getmaxyx()[1] - 6  # -6 for margins and border
+        max_width = max(1, self.pane_width - 2)  # Extra margin for wrapped lines
         
-        # Handle multi-line messages (like JSON responses)
-        if '\n' in message:
-            # For JSON responses, preserve formatting but clean up
-            lines = message.split('\n')
-            for line in lines:
-                self.api_messages.append(line.strip())
-        else:
-            # For single line messages, wrap if needed
-            wrapped_lines = []
-            current_line = ''
-            
-            for word in message.split():
-                if len(current_line) + len(word) + 1 <= max_width:
-                    current_line += (word + ' ')
-                else:
-                    if current_line:
-                        wrapped_lines.append(current_line.rstrip())
-                    current_line = word + ' '
-            if current_line:
-                wrapped_lines.append(current_line.rstrip())
-            
-            # Add each wrapped line as a separate message
-            for line in wrapped_lines:
-                self.api_messages.append(line)
-        
-        # Keep only the last N messages
-        if len(self.api_messages) > 14:
-            self.api_messages = self.api_messages[-14:]
+        for message in messages:
+            # Handle multi-line messages (like JSON responses)
+            if '\n' in message:
+                # For JSON responses, preserve formatting but clean up
+                lines = message.split('\n')
+                for line in lines:
+                    self.api_messages.append(line.strip())
+            else:
+                # For single line messages, wrap if needed and add each line as a separate message
+                self.api_messages.extend(textwrap.wrap(message, width=max_width))
 
-    def update_vm_info(self):
-        """Update both VM details and power state."""
-        current_time = time.time()
-        if current_time - self.last_update >= self.update_interval:
-            self.vm_details = get_vm_details(self.vm_id)
-            self.power_state = get_vm_power_state(self.vm_id)
-            self.last_update = current_time
-            # Only log when power state actually changes
-            if not hasattr(self, '_last_power_state') or self._last_power_state != self.power_state:
-                log_message(f"VM power state changed to: {self.power_state}")
-                self._last_power_state = self.power_state
+    def update_vm_info(self, now: float):
+        """Start a background fetch of VM details and power state if one is due."""
+        if self._info_pending or now - self.last_update < self.update_interval:
+            return
+        self._info_pending = True
+        self.last_update = now
+        vm_workers.submit(self._fetch_vm_info)
+
+    def _fetch_vm_info(self):
+        """Fetch VM info off the UI thread and hand it to the next draw."""
+        try:
+            details = get_vm_details(self.vm_id)
+            # Live, not a cached or stale state, so the back-off only counts real checks
+            power_state = get_vm_power_state(self.vm_id, cache_fallback=False, force=True)
+            self._info_results.put((details, power_state))
+        except Exception as e:
+            log_message(f"Error fetching VM info: {str(e)}", "ERROR")
+            self._info_results.put(None)
+        wake_ui()
+
+    def apply_vm_info(self):
+        """Take in fetched VM info, backing off the fetch interval while nothing changes."""
+        while not self._info_results.empty():
+            result = self._info_results.get()
+            self._info_pending = False
+            if result is None:
+                continue
+            details, power_state = result
+            if details is not None:
+                self.vm_details = details  # A failed fetch keeps the last good details on screen
+            if power_state == 'UNKNOWN' and self.power_state is not None:
+                continue  # The check failed; keep the last state and retry without backing off
+            if power_state != self.power_state:
+                # Only log when power state actually changes
+                log_message(f"VM power state changed to: {power_state}")
+                self.power_state = power_state
+                self.update_interval = self.UPDATE_INTERVAL
+            else:
+                self.update_interval = min(self.update_interval * 2, self.MAX_UPDATE_INTERVAL)
 
     def draw(self):
-        """Draw the VM menu interface."""
-        # Periodic update check
-        current_time = time.time()
-        if current_time - self.last_update >= self.update_interval:
-            self.update_vm_info()
+        """Draw the VM menu interface, repainting only the windows that changed."""
+        # Pick up worker results and fetched VM info, then start the next fetch when it's due
+        self.apply_ui_updates()
+        self.apply_vm_info()
+        self.update_vm_info(time.monotonic())
         
         # Collect any new messages
         self.collect_messages()  # This is from BaseMenu
         
-        # Clear windows
-        self.main_window.clear()
-        self.api_window.clear()
-        self.vm_messages_window.clear()
-        self.status_window.clear()
+        if self.region_changed('main', (theme_version(), self.current_row)):
+            self.draw_main_window()
+        api_tail = tuple(self.api_messages)
+        if self.region_changed('api', api_tail):
+            self.draw_api_window(api_tail)
+        status_frame = (
+            self.power_state,
+            self._details_summary(),
+            tuple(self.vm_messages)
+        )
+        if self.region_changed('vm', status_frame):
+            self.draw_vm_messages_window(status_frame)
+        log_tail = tuple(self.log_messages)  # log_messages never holds API messages
+        if self.region_changed('log', log_tail):
+            self.draw_log_window(log_tail)
         
-        # Get current theme
-        theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
+        # Flush the windows that changed in one physical update
+        curses.doupdate()
+
+    def _details_summary(self) -> tuple:
+        """Return the VM detail values shown on the status line."""
+        details = self.vm_details
+        if not details:
+            return (details is not None, None, None)
+        cpu = details.get('cpu')
+        processors = cpu.get('processors', 0) if isinstance(cpu, dict) else None
+        return (True, processors, details.get('memory'))
+
+    def draw_main_window(self):
+        """Repaint the title, navigation and option list."""
+        self.main_window.erase()
         
-        # Draw title with theme colors
-        max_y, max_x = self.main_window.getmaxyx()
-        title = f"VM: {self.vm_name}"
-        x = max_x//2 - len(title)//2
-        self.main_window.attron(curses.color_pair(1))  # Use basic text color
-        self.main_window.addstr(0, x, title, curses.A_BOLD)
-        self.main_window.attroff(curses.color_pair(1))
+        # Draw title with theme colors, positions come from cache_window_sizes
+        self.main_window.addstr(0, self._title_x, self._title, theme_attrs.CP_TEXT | curses.A_BOLD)
         
         # Draw navigation
-        navigation = "↑/↓: Navigate | Enter: Select | q: Back"
-        x = max_x//2 - len(navigation)//2
-        self.main_window.addstr(1, x, navigation)
+        self.main_window.addstr(1, self._navigation_x, NAVIGATION)
         
         # Draw separator
-        self.main_window.addstr(2, 0, "─" * max_x)
+        self.main_window.addstr(2, 0, self.separator)
         
         # Draw options
-        for idx, option in enumerate(self.options):
-            x = max_x//2 - len(option)//2
-            y = max_y//2 - len(self.options)//2 + idx
-            
-            if idx == self.current_row:
-                self.main_window.attron(curses.A_REVERSE)
-            self.main_window.addstr(y, x, option)
-            if idx == self.current_row:
-                self.main_window.attroff(curses.A_REVERSE)
+        for idx, (option, (y, x)) in enumerate(zip(self.options, self._option_pos)):
+            attr = curses.A_REVERSE if idx == self.current_row else curses.A_NORMAL
+            self.main_window.addstr(y, x, option, attr)
         
-        # Draw API window with border
-        self.api_window.clear()
+        self.main_window.noutrefresh()
+
+    def draw_api_window(self, api_tail):
+        """Repaint the API calls window."""
+        self.api_window.erase()
         self.draw_box(self.api_window)
         self.api_window.addstr(0, 2, " API Calls ")
         
         # Show API messages (raw format for VM menu)
-        max_x = self.api_window.getmaxyx()[1] - 4
-        for i, msg in enumerate(self.api_messages[-6:]):
-            try:
+        max_x = self.pane_width
+        try:
+            for i, msg in enumerate(api_tail):
                 self.api_window.addstr(i + 1, 2, msg[:max_x])
-            except curses.error:
-                pass
+        except curses.error:
+            pass
         
-        self.api_window.refresh()
+        self.api_window.noutrefresh()
 
-        # Draw VM messages window
-        self.vm_messages_window.clear()
+    def draw_vm_messages_window(self, status_frame):
+        """Repaint the VM messages window: the status line, then recent action messages."""
+        power_state, (has_details, processors, memory), messages = status_frame
+        self.vm_messages_window.erase()
         self.draw_box(self.vm_messages_window)
         self.vm_messages_window.addstr(0, 2, " VM Messages ")
         
-        # First show VM details (first line only)
-        if hasattr(self, 'vm_details'):
-            status_line = []
-            if hasattr(self, 'power_state'):
-                # Start with "Power: "
-                status = f"Power: "
-                # Add the state with appropriate color
-                self.vm_messages_window.addstr(1, 2, status)
-                
-                if self.power_state.lower() == 'poweredoff':
-                    theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
-                    self.vm_messages_window.attron(curses.color_pair(3))  # Use theme's powered_off color
-                    self.vm_messages_window.addstr(1, 2 + len(status), self.power_state)
-                    self.vm_messages_window.attroff(curses.color_pair(3))
-                elif self.power_state.lower() == 'poweredon':
-                    theme = THEMES.get(get_current_theme(), THEMES["ubuntu"])
-                    self.vm_messages_window.attron(curses.color_pair(2))  # Use theme's powered_on color
-                    self.vm_messages_window.addstr(1, 2 + len(status), self.power_state)
-                    self.vm_messages_window.attroff(curses.color_pair(2))
-                else:
-                    self.vm_messages_window.addstr(1, 2 + len(status), self.power_state)
-                
-                # Calculate where to start the next part
-                current_x = 2 + len(status) + len(self.power_state) + 3  # +3 for " | "
-                
-                # Add CPU and memory info
-                if 'cpu' in self.vm_details and isinstance(self.vm_details['cpu'], dict):
-                    processors = self.vm_details['cpu'].get('processors', 0)
-                    cpu_info = f"CPU: {processors} cores"
-                    self.vm_messages_window.addstr(1, current_x, " | " + cpu_info)
-                    current_x += len(cpu_info) + 3
-                
-                if 'memory' in self.vm_details:
-                    memory_info = f"Memory: {self.vm_details['memory']}MB"
-                    self.vm_messages_window.addstr(1, current_x, " | " + memory_info)
+        # First show VM details (first line only): label, colored state, then the rest
+        if has_details and power_state is not None:
+            status = "Power: "
+            details = ""
+            if processors is not None:
+                details += f" | CPU: {processors} cores"
+            if memory is not None:
+                details += f" | Memory: {memory}MB"
+            color = self.POWER_STATE_COLOR.get(power_state.lower())
+            attr = getattr(theme_attrs, color) if color else curses.A_NORMAL
+            self.vm_messages_window.addstr(1, 2, status)
+            self.vm_messages_window.addstr(1, 2 + len(status), power_state, attr)
+            self.vm_messages_window.addstr(1, 2 + len(status) + len(power_state), details)
         
         # Then show VM action messages (using remaining lines)
-        max_x = self.vm_messages_window.getmaxyx()[1] - 6  # -6 for margins
-        for i, msg in enumerate(self.vm_messages[-3:]):  # Show last 3 messages (leaving room for status)
-            try:
+        max_x = self.pane_width - 2  # Extra margin
+        try:
+            for i, msg in enumerate(messages):
                 self.vm_messages_window.addstr(i + 2, 2, msg[:max_x])  # Start from line 2
-            except curses.error:
-                pass
+        except curses.error:
+            pass
         
-        # Draw status window
-        self.status_window.clear()
+        self.vm_messages_window.noutrefresh()
+
+    def draw_log_window(self, log_tail):
+        """Repaint the log messages window."""
+        self.status_window.erase()
         self.draw_box(self.status_window)
         self.status_window.addstr(0, 2, " Log Messages ")
         
-        # Show only non-API messages from the parent class's log_messages
-        max_x = self.status_window.getmaxyx()[1] - 6  # -6 for margins
-        non_api_messages = [msg for msg in self.log_messages[-3:]  # Use log_messages instead of cached_messages
-                           if "API CALL:" not in msg]  # Filter out API messages
-        
-        for i, msg in enumerate(non_api_messages):
-            try:
+        # Show only non-API messages
+        max_x = self.pane_width - 2  # Extra margin
+        try:
+            for i, msg in enumerate(log_tail):
                 self.status_window.addstr(i + 2, 2, msg[:max_x])  # Start from line 2
-            except curses.error:
-                pass
+        except curses.error:
+            pass
         
-        # Refresh windows
-        self.main_window.refresh()
-        self.api_window.refresh()
-        self.vm_messages_window.refresh()
-        self.status_window.refresh()
+        self.status_window.noutrefresh()
 
     def handle_input(self, key) -> bool:
         """Handle user input in the VM menu."""
@@ -268,32 +307,44 @@ class VMMenu(BaseMenu):
             if action == "shutdown":
                 api_action = "stop"
             
-            # Add and show messages immediately
+            # Show the attempt on the next frame while the request runs on a worker,
+            # so keys are still handled while the API responds
             self.add_vm_message(f"Attempting to {action} VM...")
             log_message(f"Attempting to {action} VM: {self.vm_name}")
-            self.draw()  # Draw immediately to show the attempt message
-            
-            try:
-                is_hard = action == "stop"
-                success = vm_action(self.vm_id, api_action, force=is_hard, menu=self)
-                if success:
-                    msg = f"Successfully initiated {action}"
-                    log_message(f"Successfully initiated {action} for VM: {self.vm_name}")
-                    self.add_vm_message(msg)
-                else:
-                    msg = f"Failed to {action} VM"
-                    log_message(f"Failed to {action} VM: {self.vm_name}", "ERROR")
-                    self.add_vm_message(msg)
-            except Exception as e:
-                msg = f"Error: {str(e)}"
-                log_message(f"Error during {action} operation: {str(e)}", "ERROR")
-                self.add_vm_message(msg)
-            
-            self.draw()  # Draw again after the action completes
+            is_hard = action == "stop"
+            vm_workers.submit(self._run_action, action, api_action, is_hard)
+            self.request_draw()
         
         elif selected == "View Details":
             self.vm_details = get_vm_details(self.vm_id)
             if not self.vm_details:
                 log_message(f"Failed to fetch details for VM {self.vm_name}", "ERROR")
         
-        return True 
\ No newline at end of file
+        return True
+
+    def _post_update(self, update):
+        """Queue update to run on the UI thread and wake the UI loop."""
+        self._ui_updates.put(update)
+        wake_ui()
+
+    def _run_action(self, action: str, api_action: str, is_hard: bool):
+        """Run a power action on a worker thread and report how it went."""
+        try:
+            if vm_action(self.vm_id, api_action, force=is_hard, menu=self):
+                log_message(f"Successfully initiated {action} for VM: {self.vm_name}")
+                message = f"Successfully initiated {action}"
+            else:
+                log_message(f"Failed to {action} VM: {self.vm_name}", "ERROR")
+                message = f"Failed to {action} VM"
+        except Exception as e:
+            log_message(f"Error during {action} operation: {str(e)}", "ERROR")
+            message = f"Error: {str(e)}"
+        # The log above reaches the main menu even if this menu was closed meanwhile
+        self._post_update(partial(self._action_finished, message))
+
+    def _action_finished(self, message: str):
+        """Show a power action's outcome, on the UI thread."""
+        self.add_vm_message(message)
+        # The action should change the power state, so drop any back-off and fetch again
+        self.update_interval = self.UPDATE_INTERVAL
+        self.last_update = float('-inf')
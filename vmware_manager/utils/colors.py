@@ -9,35 +9,22 @@ def initialize_colors():
     curses.use_default_colors()
     
     themes = get_themes()
-    current_pair = 1
-    log_message("Initializing color themes...")
+    pairs_cache = {}  # (fg, bg) -> pair number, so themes sharing colors share a pair
+    
+    def pair_for(fg, bg):
+        if (fg, bg) not in pairs_cache:
+            pair = pairs_cache[(fg, bg)] = len(pairs_cache) + 1
+            curses.init_pair(pair, fg, bg)
+        return pairs_cache[(fg, bg)]
     
     # Initialize theme-specific colors and store the pair numbers back in themes
     for theme_name, theme in themes.items():
-        log_message(f"Setting up theme: {theme_name}")
-        # Title colors
-        curses.init_pair(current_pair, theme['title_fg'], theme['title_bg'])
-        theme['title_pair'] = current_pair
-        log_message(f"  {theme_name}: title_pair = {current_pair}")
-        current_pair += 1
-        
-        # Status colors
-        curses.init_pair(current_pair, theme['status_on'], -1)
-        theme['status_on_pair'] = current_pair
-        log_message(f"  {theme_name}: status_on_pair = {current_pair}")
-        current_pair += 1
-        
-        curses.init_pair(current_pair, theme['status_off'], -1)
-        theme['status_off_pair'] = current_pair
-        log_message(f"  {theme_name}: status_off_pair = {current_pair}")
-        current_pair += 1
-        
-        curses.init_pair(current_pair, theme['status_suspended'], -1)
-        theme['status_suspended_pair'] = current_pair
-        log_message(f"  {theme_name}: status_suspended_pair = {current_pair}")
-        current_pair += 1
+        theme['title_pair'] = pair_for(theme['title_fg'], theme['title_bg'])
+        theme['status_on_pair'] = pair_for(theme['status_on'], -1)
+        theme['status_off_pair'] = pair_for(theme['status_off'], -1)
+        theme['status_suspended_pair'] = pair_for(theme['status_suspended'], -1)
     
     # Store initialized themes back in settings
     initialized_themes.clear()  # Clear existing theme data
     initialized_themes.update(themes)
-    log_message(f"Color themes initialized. Available themes: {', '.join(themes.keys())}") 
\ No newline at end of file
+    log_message(f"Color themes initialized with {len(pairs_cache)} color pairs. Available themes: {', '.join(themes.keys())}")
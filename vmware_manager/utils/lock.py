@@ -1,4 +1,4 @@
 import threading
 
-# Create a lock for thread-safe operations
-menu_lock = threading.Lock() 
\ No newline at end of file
+# Create a lock for thread-safe operations (reentrant so nested UI updates can't deadlock)
+menu_lock = threading.RLock() 
\ No newline at end of file
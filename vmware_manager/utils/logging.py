@@ -1,60 +1,96 @@
+import atexit
+import queue
 import time
 import logging
-from .shared import status_log
+from logging.handlers import QueueHandler, QueueListener
+from .shared import status_log, MSG_API, MSG_LOG
+from .wakeup import wake_ui
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_QUEUE_SIZE = 10000  # Records waiting for the writer threads, oldest dropped past this
+
+class DropOldestQueueHandler(QueueHandler):
+    """Queue records for a writer thread, dropping the oldest instead of blocking when full."""
+    def enqueue(self, record):
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+def file_handler(filename: str, logger_name: str = None) -> logging.FileHandler:
+    """Return a handler writing to filename, only for logger_name's records if given."""
+    handler = logging.FileHandler(filename)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    if logger_name:
+        handler.addFilter(logging.Filter(logger_name))
+    return handler
+
+# Every logger propagates to the root logger, whose only handler queues the
+# record. One listener thread formats it and writes it to the log files.
+# vmware_manager.log gets every record, the other files only their logger's.
+log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+main_handler = file_handler('vmware_manager.log')
+ui_handler = file_handler('ui_queue.log', 'ui_queue')
+refresh_handler = file_handler('vm_refresh.log', 'vm_refresh')
+log_listener = QueueListener(log_queue, main_handler, ui_handler, refresh_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)  # Write out whatever is still queued
 
 # Configure main application logging
-logging.basicConfig(
-    filename='vmware_manager.log',
-    level=logging.INFO,  # Changed to INFO to reduce noise
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+root_logger = logging.getLogger()
+root_logger.addHandler(DropOldestQueueHandler(log_queue))
+root_logger.setLevel(logging.INFO)  # Changed to INFO to reduce noise
 
 # Create a separate logger for UI queue operations
 ui_logger = logging.getLogger('ui_queue')
-ui_handler = logging.FileHandler('ui_queue.log')
-ui_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-ui_logger.addHandler(ui_handler)
 ui_logger.setLevel(logging.DEBUG)
 
 # Create a separate logger for VM status updates
 refresh_logger = logging.getLogger('vm_refresh')
-refresh_handler = logging.FileHandler('vm_refresh.log')
-refresh_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-refresh_logger.addHandler(refresh_handler)
 refresh_logger.setLevel(logging.INFO)
 
+# log_message levels; anything else is logged as INFO
+LOG_LEVELS = {"ERROR": logging.ERROR}
+
 DEBUG = False  # Set to True to enable console printing
 
+# (second, "%H:%M:%S" string) of the last message; many messages share a second
+_last_timestamp = (0, "")
+
+def timestamp() -> str:
+    """Return the current time as HH:MM:SS, formatting it at most once per second."""
+    global _last_timestamp
+    now = int(time.time())
+    second, text = _last_timestamp  # One tuple, so threads never see a torn pair
+    if now != second:
+        text = time.strftime("%H:%M:%S", time.localtime(now))
+        _last_timestamp = (now, text)
+    return text
+
 def log_message(message: str, level: str = "INFO", refresh: bool = False) -> None:
     """Log a message to both the status queue and file."""
-    timestamp = time.strftime("%H:%M:%S")
-    formatted_msg = f"[{level}] {timestamp} - {message}"
-    
     # Log to appropriate file based on message type
+    log_level = LOG_LEVELS.get(level, logging.INFO)
     if refresh:
-        if level == "ERROR":
-            refresh_logger.error(message)
-        else:
-            refresh_logger.info(message)
+        refresh_logger.log(log_level, message)
         return  # Don't add refresh messages to UI queue
     
-    # Log non-refresh messages to main log
-    if level == "ERROR":
-        logging.error(message)
-    else:
-        logging.info(message)
+    # Log non-refresh messages to main log. The logger drops levels it filters
+    # before building a record; the UI still shows the message below.
+    root_logger.log(log_level, message)
+    formatted_msg = f"[{level}] {timestamp()} - {message}"
     
     if DEBUG:
         print(formatted_msg)
     
-    # Add message to UI queue
-    try:
-        status_log.put_nowait(formatted_msg)
-        ui_logger.debug(f"Added to UI queue: {formatted_msg}")
-    except:
-        try:
-            status_log.get_nowait()
-            status_log.put_nowait(formatted_msg)
-            ui_logger.debug(f"Replaced in UI queue: {formatted_msg}")
-        except:
-            ui_logger.error(f"Failed to add to UI queue: {formatted_msg}") 
\ No newline at end of file
+    # Add message to UI queue, tagged once here so readers don't have to scan it
+    entry = (MSG_API if message.startswith("API CALL:") else MSG_LOG, formatted_msg)
+    # deque.append is atomic and drops the oldest entry when full
+    status_log.append(entry)
+    ui_logger.debug("Added to UI queue: %s", formatted_msg)  # Formatted by the writer thread
+    wake_ui()  # New message to show
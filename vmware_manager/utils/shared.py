@@ -1,4 +1,16 @@
-from queue import Queue
+from collections import deque
 
 # Shared queues and data structures
-status_log = Queue(maxsize=1000)  # Keep more messages in memory 
\ No newline at end of file
+# Bounded so the oldest messages drop off when full, as (kind, message) tuples
+status_log = deque(maxlen=1000)
+
+# Message kinds on status_log
+MSG_API = "API"  # API call traces for the API window
+MSG_LOG = "LOG"  # Everything else, for the log window
+
+def drain_status_log() -> list:
+    """Remove and return all queued status messages.
+    
+    The UI thread is the only consumer, so popping the current length never runs dry.
+    """
+    return [status_log.popleft() for _ in range(len(status_log))]
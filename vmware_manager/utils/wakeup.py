@@ -0,0 +1,37 @@
+import os
+import select
+import sys
+
+# Self-pipe used by background threads to wake the UI loop.
+# select() only works on sockets under Windows, so fall back to polling there.
+SUPPORTED = os.name != 'nt'
+
+if SUPPORTED:
+    _read_fd, _write_fd = os.pipe()
+    os.set_blocking(_read_fd, False)
+    os.set_blocking(_write_fd, False)
+
+def wake_ui() -> None:
+    """Wake the UI loop from another thread."""
+    if not SUPPORTED:
+        return
+    try:
+        os.write(_write_fd, b'\0')
+    except (BlockingIOError, OSError):
+        pass  # Pipe already full, the UI will wake anyway
+
+def wait_for_input(timeout=None) -> None:
+    """Block until stdin is readable, wake_ui() is called, or timeout expires."""
+    if not SUPPORTED:
+        return
+    try:
+        readable, _, _ = select.select([sys.stdin.fileno(), _read_fd], [], [], timeout)
+    except (OSError, ValueError):
+        return
+    if _read_fd in readable:
+        # Drain pending wakeups so the next wait blocks again
+        try:
+            while os.read(_read_fd, 512):
+                pass
+        except BlockingIOError:
+            pass
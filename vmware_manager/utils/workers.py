@@ -0,0 +1,47 @@
+import queue
+import threading
+from .logging import log_message
+
+class WorkerPool:
+    """A few daemon threads running submitted calls, started on first use.
+
+    Unlike ThreadPoolExecutor, whose threads are joined at interpreter exit,
+    a call still waiting on the API doesn't hold up quitting.
+    """
+    def __init__(self, max_workers: int, name: str):
+        self.max_workers = max_workers
+        self.name = name
+        self._tasks = queue.SimpleQueue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, func, *args, **kwargs) -> None:
+        """Run func(*args, **kwargs) on a worker thread. Report results from func itself."""
+        with self._lock:
+            if self._shutdown:
+                return
+            if not self._threads:
+                for i in range(self.max_workers):
+                    thread = threading.Thread(target=self._run, daemon=True, name=f"{self.name}_{i}")
+                    thread.start()
+                    self._threads.append(thread)
+        self._tasks.put((func, args, kwargs))
+
+    def shutdown(self) -> None:
+        """Stop taking work and let idle workers exit; queued calls are dropped."""
+        with self._lock:
+            self._shutdown = True
+            for _ in self._threads:
+                self._tasks.put(None)
+
+    def _run(self):
+        while True:
+            task = self._tasks.get()
+            if task is None or self._shutdown:
+                return
+            func, args, kwargs = task
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                log_message(f"Error in {self.name} worker: {str(e)}", "ERROR")